@@ -12,14 +12,27 @@ Tables exported (prioritized by value):
 4. crystallization_events - WYKYK moments
 5. wisdom - Crystallized understandings
 6. chatroom_turns - Recent collaboration context
+
+With --recall QUERY, the memories and memory boxes closest in meaning to
+QUERY (semantic kNN via mempheromone_membox.recall) lead the context.
+
+Sections are queried concurrently on pooled connections that all import
+one exported snapshot, so the export is consistent and takes roughly as
+long as its slowest section.
 """
 
+import io
 import os
 import sys
 import json
+import time
 import argparse
+import heapq
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from operator import itemgetter
 from pathlib import Path
+from typing import Callable, Iterator, NamedTuple, Optional, Tuple
 
 try:
     import psycopg2
@@ -30,10 +43,31 @@ except ImportError:
     import psycopg2
     import psycopg2.extras
 
+import psycopg2.pool
+from psycopg2.extensions import ISOLATION_LEVEL_REPEATABLE_READ
 
-def get_connection():
-    """Get database connection using standard mempheromone config."""
-    return psycopg2.connect(
+# Per-section export cache ('off' disables it)
+EXPORT_CACHE_PATH = os.getenv(
+    'MEMPHEROMONE_EXPORT_CACHE',
+    os.path.expanduser('~/.cache/mempheromone/export_sections.json')
+)
+
+# Bump when section formatting changes so cached text is rebuilt
+EXPORT_CACHE_VERSION = 2
+
+# --budget ranking: an item's score is weight * (1 + recency) * box bonus,
+# where recency halves every RECENCY_HALF_LIFE_DAYS
+RECENCY_HALF_LIFE_DAYS = 14
+BOX_MEMBER_BONUS = 1.25     # memories that belong to a memory box
+CHARS_PER_TOKEN = 4         # --budget-unit tokens approximation
+PACK_ITERSIZE = 64          # ranked rows fetched per round trip
+PACK_MAX_SKIPS = 32         # consecutive items that did not fit before giving up
+EXPORT_JOBS = 3             # default --jobs; each job opens its own connection
+
+
+def connection_params() -> dict:
+    """Standard mempheromone connection config."""
+    return dict(
         host=os.environ.get('PGHOST', 'localhost'),
         port=os.environ.get('PGPORT', '5432'),
         database=os.environ.get('PGDATABASE', 'mempheromone'),
@@ -42,6 +76,11 @@ def get_connection():
     )
 
 
+def get_connection():
+    """Get database connection using standard mempheromone config."""
+    return psycopg2.connect(**connection_params())
+
+
 def export_claude_memories(conn, limit=500):
     """Export Claude's personal memories (insights, learnings, decisions)."""
     with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
@@ -135,6 +174,18 @@ def export_exocortex_memories(conn, limit=200):
         return cur.fetchall()
 
 
+def export_recall(conn, query, k=20):
+    """Export the memories and boxes semantically closest to query."""
+    if not query:
+        return []
+    try:
+        from mempheromone_membox import recall
+    except ImportError as e:
+        print(f"Recall unavailable ({e})", file=sys.stderr)
+        return []
+    return recall(query, k, conn=conn)
+
+
 def export_memory_boxes(conn, limit=50, min_score=8.0):
     """Export topic-continuous memory boxes with trace links."""
     with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
@@ -165,120 +216,714 @@ def export_memory_boxes(conn, limit=50, min_score=8.0):
         return {'boxes': boxes, 'links': links}
 
 
+def format_recall(hits) -> Iterator[str]:
+    yield "\n\n## RECALL (Semantic Matches)"
+    yield "-" * 60
+    for h in hits:
+        score = float(h['pheromone_score']) if h.get('pheromone_score') is not None else 0
+        yield f"• [{h['type']}] (sim: {float(h['similarity']):.2f} | score: {score:.1f}) {h['content'][:300]}"
+
+
+def format_memories(memories) -> Iterator[str]:
+    yield "\n## CLAUDE MEMORIES (Personal Learnings)"
+    yield "-" * 60
+    for m in memories:
+        yield f"\n### [{m['memory_type'].upper()}] {m['topic']}"
+        yield f"Content: {m['content']}"
+        if m.get('context'):
+            yield f"Context: {m['context']}"
+        yield f"Confidence: {m.get('confidence', 'N/A')}"
+
+
+def format_facts(facts) -> Iterator[str]:
+    yield "\n\n## DEBUGGING FACTS (Proven Solutions)"
+    yield "-" * 60
+    for f in facts:
+        yield f"\n### Problem: {f['symptom'][:200]}"
+        yield f"Solution: {f['solution'][:500]}"
+        score = float(f['pheromone_score']) if f.get('pheromone_score') else 0
+        yield f"Score: {score:.1f} | Verified: {f.get('verified_count', 0)}x | Source: {f.get('source', 'unknown')}"
+
+
+def format_narratives(narratives) -> Iterator[str]:
+    yield "\n\n## SESSION NARRATIVES (Past Session Summaries)"
+    yield "-" * 60
+    for n in narratives:
+        yield f"\n### Session {str(n.get('session_id', 'unknown'))[:8]}"
+        yield f"Arc: {n.get('narrative_arc', 'unknown')} | Shape: {n.get('affective_shape', 'unknown')}"
+        if n.get('start_state'):
+            yield f"Start: {n['start_state'][:200]}"
+        if n.get('end_state'):
+            yield f"End: {n['end_state'][:200]}"
+        if n.get('topics'):
+            topics = n['topics'] if isinstance(n['topics'], list) else []
+            yield f"Topics: {', '.join(topics[:5])}"
+
+
+def format_crystallizations(crystallizations) -> Iterator[str]:
+    yield "\n\n## CRYSTALLIZATIONS (WYKYK Moments)"
+    yield "-" * 60
+    for c in crystallizations:
+        yield f"\n### [{c.get('certainty_type', 'UNKNOWN')}]"
+        if c.get('understanding_as_crystallized'):
+            yield f"Understanding: {c['understanding_as_crystallized'][:500]}"
+        if c.get('what_changed'):
+            yield f"What changed: {c['what_changed'][:200]}"
+        if c.get('question_as_held'):
+            yield f"Question held: {c['question_as_held'][:150]}"
+        temp = c.get('temperature', 'N/A')
+        amp = c.get('amplitude', 'N/A')
+        yield f"Temperature: {temp} | Amplitude: {amp}"
+
+
+def format_wisdom(wisdom) -> Iterator[str]:
+    yield "\n\n## WISDOM (Crystallized Understandings)"
+    yield "-" * 60
+    for w in wisdom:
+        yield f"\n- {w['insight'][:300]}"
+        conf = float(w['confidence']) if w.get('confidence') else 0
+        yield f"  (By: {w.get('discovered_by', 'unknown')} | Domain: {w.get('domain', 'general')} | Confidence: {conf:.2f} | Applied: {w.get('times_applied', 0)}x)"
+
+
+def format_chat(chat) -> Iterator[str]:
+    yield "\n\n## RECENT COLLABORATION (Last 7 Days)"
+    yield "-" * 60
+    for c in reversed(chat[-50:]):  # Show chronologically
+        ts = c['created_at'].strftime('%m-%d %H:%M') if c.get('created_at') else ''
+        yield f"[{ts}] {c['participant']}: {c['content'][:200]}"
+
+
+def format_membox(membox) -> Iterator[str]:
+    boxes = membox.get('boxes', [])
+    links = membox.get('links', [])
+    if not boxes:
+        return
+
+    yield "\n\n## MEMORY BOXES (Topic-Continuous Groups)"
+    yield "-" * 60
+    for b in boxes:
+        yield f"\n### {b['topic'][:80]}"
+        score = float(b['pheromone_score']) if b.get('pheromone_score') else 0
+        yield f"Memories: {b.get('memory_count', 0)} | Score: {score:.1f}"
+        if b.get('keywords'):
+            kw = b['keywords'] if isinstance(b['keywords'], list) else []
+            yield f"Keywords: {', '.join(kw[:8])}"
+        if b.get('events'):
+            ev = b['events'] if isinstance(b['events'], list) else []
+            yield f"Events: {', '.join(ev[:5])}"
+        if b.get('summary'):
+            yield f"Summary: {b['summary'][:200]}"
+
+    if links:
+        yield "\n### Trace Links (Cross-Topic Connections)"
+        for lk in links[:20]:
+            yield f"  → {lk.get('target_topic', 'unknown')[:50]} (via: {', '.join((lk.get('linking_events') or [])[:3])})"
+
+
+def format_nothing(rows) -> Iterator[str]:
+    """Exported for --json consumers only; not part of the text context."""
+    return iter(())
+
+
+def _rank_score(weight: str, created: str, memory_type: Optional[str] = None,
+                memory_id: Optional[str] = None) -> str:
+    """SQL for an item's --budget score; NULL inputs score 0."""
+    recency = (f"power(0.5, EXTRACT(EPOCH FROM NOW() - {created}) / 86400.0 "
+               f"/ %(half_life)s)")
+    bonus = '1'
+    if memory_type:
+        bonus = (f"CASE WHEN EXISTS (SELECT 1 FROM memory_box_items mbi "
+                 f"WHERE mbi.memory_type = '{memory_type}' AND mbi.memory_id = {memory_id}) "
+                 f"THEN %(box_bonus)s ELSE 1 END")
+    return f"COALESCE(({weight}) * (1 + {recency}) * {bonus}, 0)::float8 AS rank_score"
+
+
+def _box_pheromone(memory_type: str, memory_id: str) -> str:
+    """SQL for the pheromone of the strongest box holding a memory, else 10."""
+    return (f"COALESCE((SELECT MAX(mb.pheromone_score) FROM memory_box_items mbi "
+            f"JOIN memory_boxes mb ON mb.id = mbi.box_id "
+            f"WHERE mbi.memory_type = '{memory_type}' AND mbi.memory_id = {memory_id}), 10)")
+
+
+# Ranked candidate queries for --budget, best first; same columns and
+# filters as the export functions.
+#
+# Weights share the pheromone scale, where 10 is an unremarkable item
+# (the default pheromone_score), so sections compete on equal terms:
+#   facts, boxes       their pheromone_score
+#   memories           20 * confidence (0.5 -> 10)
+#   wisdom             20 * confidence + times applied (up to 10)
+#   narratives,        no score of their own: the pheromone of the
+#   crystallizations   strongest box holding them, else 10
+#   chat               constant 5, so it ranks newest first
+RANKED_MEMORIES_SQL = f"""
+    SELECT id, memory_type, topic, content, context, confidence, created_at,
+           {_rank_score('20 * COALESCE(confidence, 0.5)', 'created_at', 'claude_memory', 'claude_memories.id')}
+    FROM claude_memories
+    ORDER BY rank_score DESC
+    LIMIT %(memories)s
+"""
+
+RANKED_FACTS_SQL = f"""
+    SELECT fact_id, symptom, solution, pheromone_score,
+           verified_count, outcome, source, first_seen,
+           {_rank_score('pheromone_score', 'first_seen', 'debugging_fact', 'debugging_facts.fact_id')}
+    FROM debugging_facts
+    WHERE pheromone_score >= %(min_score)s AND is_archived = false
+    ORDER BY rank_score DESC
+    LIMIT %(facts)s
+"""
+
+RANKED_NARRATIVES_SQL = f"""
+    SELECT id, session_id, start_state, end_state, narrative_arc,
+           affective_shape, topics, created_at,
+           {_rank_score(_box_pheromone('narrative', 'session_narratives.id'), 'created_at', 'narrative', 'session_narratives.id')}
+    FROM session_narratives
+    ORDER BY rank_score DESC
+    LIMIT 50
+"""
+
+RANKED_CRYSTALLIZATIONS_SQL = f"""
+    SELECT id, certainty_type, understanding_as_crystallized, what_changed,
+           question_as_held, temperature, amplitude, created_at,
+           {_rank_score(_box_pheromone('crystallization', 'crystallization_events.id'), 'created_at', 'crystallization', 'crystallization_events.id')}
+    FROM crystallization_events
+    WHERE certainty_type IN ('WYKYK', 'PROBABLE')
+    ORDER BY rank_score DESC
+    LIMIT 200
+"""
+
+RANKED_WISDOM_SQL = f"""
+    SELECT insight, context, discovered_by, confidence,
+           times_applied, domain, created_at,
+           {_rank_score('20 * COALESCE(confidence, 0.5) + LEAST(COALESCE(times_applied, 0), 10)', 'created_at')}
+    FROM wisdom
+    ORDER BY rank_score DESC
+    LIMIT 300
+"""
+
+# Constant weight, so best first is also newest first, as format_chat expects
+RANKED_CHAT_SQL = f"""
+    SELECT participant, content, created_at,
+           {_rank_score('5', 'created_at')}
+    FROM chatroom_turns
+    WHERE created_at > NOW() - INTERVAL '7 days'
+    ORDER BY rank_score DESC
+    LIMIT 50
+"""
+
+RANKED_BOXES_SQL = f"""
+    SELECT mb.id, mb.topic, mb.keywords, mb.events, mb.summary,
+           mb.memory_count, mb.pheromone_score, mb.start_time, mb.end_time,
+           {_rank_score('mb.pheromone_score', 'mb.end_time')}
+    FROM memory_boxes mb
+    WHERE mb.is_active = TRUE AND mb.pheromone_score >= 8.0
+    ORDER BY rank_score DESC
+    LIMIT 50
+"""
+
+
+class ExportSection(NamedTuple):
+    key: str                # data / stats key
+    label: str              # progress output
+    export: Callable        # (conn, args) -> rows
+    format: Callable        # rows -> context lines
+    sources: Tuple          # (table, timestamp column, filter) triples fingerprinted for the cache;
+                            # column None: the table_changes counter covers the table
+    ranked: Optional[str] = None    # best-first candidate query for --budget
+
+
+# Sections in output order
+EXPORT_SECTIONS = [
+    ExportSection('recall', 'semantic recall',
+                  lambda conn, args: export_recall(conn, args.recall, args.recall_k),
+                  format_recall,
+                  (('embeddings', None, None), ('memory_boxes', None, None))),
+    ExportSection('memories', 'claude_memories',
+                  lambda conn, args: export_claude_memories(conn, args.memories),
+                  format_memories,
+                  (('claude_memories', None, None),),
+                  RANKED_MEMORIES_SQL),
+    ExportSection('facts', 'debugging_facts',
+                  lambda conn, args: export_debugging_facts(conn, args.min_score, args.facts),
+                  format_facts,
+                  (('debugging_facts', None, None),),
+                  RANKED_FACTS_SQL),
+    ExportSection('narratives', 'session_narratives',
+                  lambda conn, args: export_session_narratives(conn),
+                  format_narratives,
+                  (('session_narratives', None, None),),
+                  RANKED_NARRATIVES_SQL),
+    ExportSection('crystallizations', 'crystallizations',
+                  lambda conn, args: export_crystallizations(conn),
+                  format_crystallizations,
+                  (('crystallization_events', None, None),),
+                  RANKED_CRYSTALLIZATIONS_SQL),
+    ExportSection('wisdom', 'wisdom',
+                  lambda conn, args: export_wisdom(conn),
+                  format_wisdom,
+                  (('wisdom', None, None),),
+                  RANKED_WISDOM_SQL),
+    ExportSection('chat', 'recent chat',
+                  lambda conn, args: export_recent_chat(conn),
+                  format_chat,
+                  (('chatroom_turns', 'created_at', "created_at > NOW() - INTERVAL '7 days'"),),
+                  RANKED_CHAT_SQL),
+    ExportSection('exocortex', 'exocortex memories',
+                  lambda conn, args: export_exocortex_memories(conn),
+                  format_nothing,
+                  (('exocortex_memory_bank', 'created_at', None),)),
+    ExportSection('membox', 'memory boxes',
+                  lambda conn, args: export_memory_boxes(conn),
+                  format_membox,
+                  (('memory_boxes', None, None), ('trace_links', None, None)),
+                  RANKED_BOXES_SQL),
+]
+
+
+def section_data(section: ExportSection, rows: list):
+    """Shape a list of rows the way the section's export returns them."""
+    if section.key == 'membox':
+        return {'boxes': rows, 'links': []}
+    return rows
+
+
+def section_stats(section: ExportSection, rows) -> dict:
+    """Row counts reported in the stats line."""
+    if section.key == 'membox':
+        return {
+            'membox_boxes': len(rows.get('boxes', [])),
+            'membox_links': len(rows.get('links', [])),
+        }
+    return {section.key: len(rows)}
+
+
+def begin_snapshot(conn):
+    """Make conn's next transaction a read-only REPEATABLE READ snapshot."""
+    if conn.status != psycopg2.extensions.STATUS_READY:
+        conn.rollback()
+    conn.set_session(isolation_level=ISOLATION_LEVEL_REPEATABLE_READ, readonly=True)
+
+
+def export_sections(conn, args, sections=EXPORT_SECTIONS, jobs: int = 1, quiet: bool = True) -> dict:
+    """
+    Run the given sections' queries against one snapshot; returns {key: rows}.
+
+    conn may already be inside a transaction opened after begin_snapshot(),
+    in which case that snapshot is the one exported. With jobs > 1, conn
+    exports its snapshot (pg_export_snapshot) and holds it open while
+    `jobs` pooled connections import it (SET TRANSACTION SNAPSHOT) and
+    run the sections concurrently. Pool connections are opened lazily by
+    the worker threads, so connection setup overlaps with the first
+    queries. If the snapshot is unavailable, or a worker cannot connect,
+    the affected sections run one after another inside conn's own
+    transaction instead.
+    """
+    sections = list(sections)
+    if not sections:
+        return {}
+    if conn.status == psycopg2.extensions.STATUS_READY:
+        begin_snapshot(conn)
+
+    jobs = min(jobs, len(sections))
+    pool = None
+    if jobs > 1:
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_export_snapshot()")
+                snapshot = cur.fetchone()[0]
+            pool = psycopg2.pool.ThreadedConnectionPool(0, jobs, **connection_params())
+        except psycopg2.Error as e:
+            if not quiet:
+                print(f"Concurrent export unavailable ({e}), exporting serially...")
+            begin_snapshot(conn)
+
+    def report(label, started):
+        if not quiet:
+            print(f"Exported {label} ({time.perf_counter() - started:.2f}s)")
+
+    data = {}
+    if pool is None:
+        for section in sections:
+            started = time.perf_counter()
+            data[section.key] = section.export(conn, args)
+            report(section.label, started)
+        return data
+
+    unavailable = object()
+
+    def run(export):
+        try:
+            section_conn = pool.getconn()
+        except psycopg2.Error:
+            return unavailable
+        try:
+            begin_snapshot(section_conn)
+            with section_conn.cursor() as cur:
+                cur.execute("SET TRANSACTION SNAPSHOT %s", (snapshot,))
+            return export(section_conn, args)
+        finally:
+            section_conn.rollback()
+            pool.putconn(section_conn)
+
+    try:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            started = time.perf_counter()
+            futures = {
+                executor.submit(run, section.export): section
+                for section in sections
+            }
+            for future in as_completed(futures):
+                section = futures[future]
+                data[section.key] = future.result()
+                if data[section.key] is not unavailable:
+                    report(section.label, started)
+    finally:
+        pool.closeall()
+
+    # conn still holds the exported snapshot, so these see the same data
+    for section in sections:
+        if data[section.key] is unavailable:
+            started = time.perf_counter()
+            data[section.key] = section.export(conn, args)
+            report(section.label, started)
+
+    # Restore output order
+    return {section.key: data[section.key] for section in sections}
+
+def _render(section: ExportSection, data) -> str:
+    return '\n'.join(section.format(data))
+
+
+def item_cost(section: ExportSection, row, first: bool) -> int:
+    """
+    Characters one more row adds to its section's text. The first row
+    also pays for the section heading and the line break before it.
+    """
+    one = len(_render(section, section_data(section, [row])))
+    if first:
+        return one + 1
+    return len(_render(section, section_data(section, [row, row]))) - one
+
+
+def pack_sections(conn, args, budget: int, quiet: bool = True) -> dict:
+    """
+    Fill a character budget with the best items across all sections;
+    returns {key: rows} like export_sections().
+
+    Every section with a ranked query streams its candidates best first
+    through a server-side cursor; heapq.merge interleaves the streams
+    into one global ranking. Items are taken while they fit, and the
+    cursors are abandoned once the budget is used up (or PACK_MAX_SKIPS
+    items in a row did not fit), so low-ranked rows are never fetched.
+    Trace links for the chosen boxes are added last if room remains.
+    --recall matches were asked for explicitly, so they are placed first.
+    """
+    if conn.status == psycopg2.extensions.STATUS_READY:
+        begin_snapshot(conn)
+    params = {
+        'half_life': RECENCY_HALF_LIFE_DAYS,
+        'box_bonus': BOX_MEMBER_BONUS,
+        'min_score': args.min_score,
+        'memories': args.memories,
+        'facts': args.facts,
+    }
+    ranked = {section.key: section for section in EXPORT_SECTIONS if section.ranked}
+    selected = {key: [] for key in ranked}
+    remaining = budget - len(format_for_rlm({}))
+    considered = 0
+
+    recall_section = next(section for section in EXPORT_SECTIONS if section.key == 'recall')
+    hits = recall_section.export(conn, args)
+    while hits and len(_render(recall_section, hits)) + 1 > remaining:
+        hits.pop()
+    if hits:
+        remaining -= len(_render(recall_section, hits)) + 1
+
+    def candidates(section, cur):
+        for row in cur:
+            yield row['rank_score'], section, row
+
+    cursors = []
+    try:
+        streams = []
+        for section in ranked.values():
+            cur = conn.cursor(name=f"pack_{section.key}",
+                              cursor_factory=psycopg2.extras.RealDictCursor)
+            cur.itersize = PACK_ITERSIZE
+            cur.execute(section.ranked, params)
+            cursors.append(cur)
+            streams.append(candidates(section, cur))
+
+        skips = 0
+        for _, section, row in heapq.merge(*streams, key=itemgetter(0), reverse=True):
+            considered += 1
+            rows = selected[section.key]
+            cost = item_cost(section, row, first=not rows)
+            if cost <= remaining:
+                rows.append(row)
+                remaining -= cost
+                skips = 0
+            else:
+                skips += 1
+            if remaining <= 0 or skips >= PACK_MAX_SKIPS:
+                break
+    finally:
+        for cur in cursors:
+            cur.close()
+
+    data = {section.key: section_data(section, [])
+            for section in EXPORT_SECTIONS}
+    data.update({key: section_data(ranked[key], rows) for key, rows in selected.items()})
+    data['recall'] = hits
+
+    boxes = data['membox']['boxes']
+    if boxes:
+        with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
+            cur.execute("""
+                SELECT tl.source_box_id, tl.target_box_id, tl.link_type,
+                       tl.similarity_score, tl.linking_events,
+                       mb.topic as target_topic
+                FROM trace_links tl
+                JOIN memory_boxes mb ON mb.id = tl.target_box_id
+                WHERE tl.source_box_id = ANY(%s::uuid[])
+                  AND tl.similarity_score >= 0.5
+                ORDER BY tl.similarity_score DESC
+                LIMIT 20
+            """, ([str(box['id']) for box in boxes],))
+            links = cur.fetchall()
+
+        membox = ranked['membox']
+        base = len(_render(membox, data['membox']))
+        while links and len(_render(membox, {'boxes': boxes, 'links': links})) - base > remaining:
+            links.pop()
+        data['membox']['links'] = links
+
+    if not quiet:
+        packed = sum(len(rows) for rows in selected.values())
+        print(f"Packed {packed} of {considered} ranked items into a {budget:,} char budget")
+    return data
+
+
+def section_fingerprints(conn, args, sections=EXPORT_SECTIONS) -> dict:
+    """
+    Cheap per-section change fingerprints; returns {key: fingerprint}.
+
+    Tables in the mempheromone schema are fingerprinted by their
+    table_changes counter, which statement triggers bump on every insert,
+    update, delete or truncate. It is transactional, so read inside the
+    export snapshot it matches the data exactly. Tables outside the schema
+    contribute their latest timestamp instead, plus a row count
+    when the section only reads a time window, so rows ageing out of it
+    count as a change. The export settings are folded in so changing a
+    limit misses the cache.
+
+    Returns {} if the schema has no table_changes yet; nothing can be
+    reused then.
+    """
+    counted, branches, params = [], [], []
+    for section in sections:
+        for table, column, condition in section.sources:
+            if column is None:
+                counted.append(table)
+            elif condition:
+                branches.append(f"SELECT %s, %s, max({column})::text, count(*) FROM {table} WHERE {condition}")
+                params += [section.key, table]
+            else:
+                branches.append(f"SELECT %s, %s, max({column})::text, NULL::bigint FROM {table}")
+                params += [section.key, table]
+
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass('table_changes') IS NOT NULL")
+        if not cur.fetchone()[0]:
+            return {}
+        cur.execute("""
+            SELECT table_name, sum(changes)
+            FROM table_changes
+            WHERE table_name = ANY(%s)
+            GROUP BY table_name
+        """, (counted,))
+        changes = {table: int(total) for table, total in cur.fetchall()}
+        latest = []
+        if branches:
+            cur.execute(' UNION ALL '.join(branches), params)
+            latest = cur.fetchall()
+
+    settings = [EXPORT_CACHE_VERSION, args.memories, args.facts, args.min_score,
+                args.recall, args.recall_k]
+    fingerprints = {section.key: [settings] for section in sections}
+    for section in sections:
+        for table, column, _ in section.sources:
+            if column is None:
+                fingerprints[section.key].append([table, changes.get(table, 0)])
+    for key, table, timestamp, count in latest:
+        fingerprints[key].append([table, timestamp, count])
+    return fingerprints
+
+
+def load_section_cache(path: Path) -> dict:
+    """Cached sections: {key: {'fingerprint', 'text', 'stats'}}; empty if unreadable."""
+    try:
+        with open(path) as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_section_cache(path: Path, cache: dict):
+    """Replace the cache file atomically."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, path)
+
+
+class ContextWriter:
+    """
+    Streams the RLM context to a binary file one line at a time and
+    records where each section lands (byte offset and length) for the
+    sidecar index, so readers can seek straight to a section.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.size = 0       # bytes written
+        self.chars = 0      # characters written
+        self.sections = []
+
+    def _write(self, text: str):
+        data = text.encode('utf-8')
+        self.f.write(data)
+        self.size += len(data)
+        self.chars += len(text)
+
+    def begin(self):
+        self._write('\n'.join([
+            "=" * 80,
+            "MEMPHEROMONE DATABASE CONTEXT",
+            f"Exported: {datetime.now().isoformat()}",
+            "=" * 80,
+        ]))
+
+    def section(self, key: str, lines, counts: dict) -> str:
+        """Write a section's lines; returns the section text."""
+        written = []
+        offset = None
+        for line in lines:
+            self._write('\n')
+            if offset is None:
+                offset = self.size
+            self._write(line)
+            written.append(line)
+
+        text = '\n'.join(written)
+        if offset is not None:
+            title = next((line.strip() for line in text.split('\n') if line.startswith('## ')), key)
+            self.sections.append({
+                'key': key,
+                'title': title,
+                'offset': offset,
+                'length': self.size - offset,
+                'counts': counts,
+            })
+        return text
+
+    def end(self):
+        self._write('\n' + '\n'.join([
+            "\n" + "=" * 80,
+            "END MEMPHEROMONE CONTEXT",
+            "=" * 80,
+        ]))
+
+
 def format_for_rlm(data: dict) -> str:
     """Format exported data as structured text for RLM context."""
-    lines = []
-
-    lines.append("=" * 80)
-    lines.append("MEMPHEROMONE DATABASE CONTEXT")
-    lines.append(f"Exported: {datetime.now().isoformat()}")
-    lines.append("=" * 80)
-
-    # Claude Memories
-    if data.get('memories'):
-        lines.append("\n## CLAUDE MEMORIES (Personal Learnings)")
-        lines.append("-" * 60)
-        for m in data['memories']:
-            lines.append(f"\n### [{m['memory_type'].upper()}] {m['topic']}")
-            lines.append(f"Content: {m['content']}")
-            if m.get('context'):
-                lines.append(f"Context: {m['context']}")
-            lines.append(f"Confidence: {m.get('confidence', 'N/A')}")
-
-    # Debugging Facts
-    if data.get('facts'):
-        lines.append("\n\n## DEBUGGING FACTS (Proven Solutions)")
-        lines.append("-" * 60)
-        for f in data['facts']:
-            lines.append(f"\n### Problem: {f['symptom'][:200]}")
-            lines.append(f"Solution: {f['solution'][:500]}")
-            score = float(f['pheromone_score']) if f.get('pheromone_score') else 0
-            lines.append(f"Score: {score:.1f} | Verified: {f.get('verified_count', 0)}x | Source: {f.get('source', 'unknown')}")
-
-    # Session Narratives
-    if data.get('narratives'):
-        lines.append("\n\n## SESSION NARRATIVES (Past Session Summaries)")
-        lines.append("-" * 60)
-        for n in data['narratives']:
-            lines.append(f"\n### Session {str(n.get('session_id', 'unknown'))[:8]}")
-            lines.append(f"Arc: {n.get('narrative_arc', 'unknown')} | Shape: {n.get('affective_shape', 'unknown')}")
-            if n.get('start_state'):
-                lines.append(f"Start: {n['start_state'][:200]}")
-            if n.get('end_state'):
-                lines.append(f"End: {n['end_state'][:200]}")
-            if n.get('topics'):
-                topics = n['topics'] if isinstance(n['topics'], list) else []
-                lines.append(f"Topics: {', '.join(topics[:5])}")
-
-    # Crystallizations
-    if data.get('crystallizations'):
-        lines.append("\n\n## CRYSTALLIZATIONS (WYKYK Moments)")
-        lines.append("-" * 60)
-        for c in data['crystallizations']:
-            lines.append(f"\n### [{c.get('certainty_type', 'UNKNOWN')}]")
-            if c.get('understanding_as_crystallized'):
-                lines.append(f"Understanding: {c['understanding_as_crystallized'][:500]}")
-            if c.get('what_changed'):
-                lines.append(f"What changed: {c['what_changed'][:200]}")
-            if c.get('question_as_held'):
-                lines.append(f"Question held: {c['question_as_held'][:150]}")
-            temp = c.get('temperature', 'N/A')
-            amp = c.get('amplitude', 'N/A')
-            lines.append(f"Temperature: {temp} | Amplitude: {amp}")
-
-    # Wisdom
-    if data.get('wisdom'):
-        lines.append("\n\n## WISDOM (Crystallized Understandings)")
-        lines.append("-" * 60)
-        for w in data['wisdom']:
-            lines.append(f"\n- {w['insight'][:300]}")
-            conf = float(w['confidence']) if w.get('confidence') else 0
-            lines.append(f"  (By: {w.get('discovered_by', 'unknown')} | Domain: {w.get('domain', 'general')} | Confidence: {conf:.2f} | Applied: {w.get('times_applied', 0)}x)")
-
-    # Recent Chat
-    if data.get('chat'):
-        lines.append("\n\n## RECENT COLLABORATION (Last 7 Days)")
-        lines.append("-" * 60)
-        for c in reversed(data['chat'][-50:]):  # Show chronologically
-            ts = c['created_at'].strftime('%m-%d %H:%M') if c.get('created_at') else ''
-            lines.append(f"[{ts}] {c['participant']}: {c['content'][:200]}")
-
-    # Memory Boxes (Topic-Continuous Groups)
-    if data.get('membox'):
-        boxes = data['membox'].get('boxes', [])
-        links = data['membox'].get('links', [])
-        if boxes:
-            lines.append("\n\n## MEMORY BOXES (Topic-Continuous Groups)")
-            lines.append("-" * 60)
-            for b in boxes:
-                lines.append(f"\n### {b['topic'][:80]}")
-                score = float(b['pheromone_score']) if b.get('pheromone_score') else 0
-                lines.append(f"Memories: {b.get('memory_count', 0)} | Score: {score:.1f}")
-                if b.get('keywords'):
-                    kw = b['keywords'] if isinstance(b['keywords'], list) else []
-                    lines.append(f"Keywords: {', '.join(kw[:8])}")
-                if b.get('events'):
-                    ev = b['events'] if isinstance(b['events'], list) else []
-                    lines.append(f"Events: {', '.join(ev[:5])}")
-                if b.get('summary'):
-                    lines.append(f"Summary: {b['summary'][:200]}")
-
-            if links:
-                lines.append("\n### Trace Links (Cross-Topic Connections)")
-                for lk in links[:20]:
-                    lines.append(f"  → {lk.get('target_topic', 'unknown')[:50]} (via: {', '.join((lk.get('linking_events') or [])[:3])})")
-
-    lines.append("\n" + "=" * 80)
-    lines.append("END MEMPHEROMONE CONTEXT")
-    lines.append("=" * 80)
-
-    return '\n'.join(lines)
+    buffer = io.BytesIO()
+    writer = ContextWriter(buffer)
+    writer.begin()
+    for section in EXPORT_SECTIONS:
+        rows = data.get(section.key)
+        if rows:
+            writer.section(section.key, section.format(rows), section_stats(section, rows))
+    writer.end()
+    return buffer.getvalue().decode('utf-8')
+
+
+def write_index(path: Path, context_path: str, writer: ContextWriter):
+    """Sidecar index: byte offset, length and row counts of each section."""
+    with open(path, 'w') as f:
+        json.dump({
+            'context_file': context_path,
+            'size': writer.size,
+            'exported_at': datetime.now().isoformat(),
+            'sections': writer.sections,
+        }, f, indent=2)
+
+
+# Sections quoted in the session-start digest, with their line caps
+DIGEST_SECTIONS = [('narratives', 60), ('crystallizations', 40), ('facts', 50)]
+
+
+def size_display(size: int) -> str:
+    if size > 1000000:
+        return f"{size // 1000000}MB"
+    if size > 1000:
+        return f"{size // 1000}KB"
+    return f"{size}B"
+
+
+def build_digest(texts: dict, context_path: str, output_size: int) -> str:
+    """Short excerpt of the freshest sections for the session-start message."""
+    lines = [
+        "## MEMPHEROMONE DIGEST",
+        f"Full context: {context_path} ({size_display(output_size)})",
+        "",
+    ]
+    for key, max_lines in DIGEST_SECTIONS:
+        text = texts.get(key, '').lstrip('\n')
+        if text:
+            lines.extend(text.split('\n')[:max_lines])
+        lines.append("")
+    return '\n'.join(lines) + '\n'
+
+
+def hook_output(stats: dict, args, digest: str) -> dict:
+    """SessionStart hook response announcing the exported context."""
+    context_path = args.output
+    message = (
+        f"## Mempheromone Database Loaded\n\n"
+        f"Your memory context has been exported ({size_display(stats['output_size'])}):\n"
+        f"- Claude Memories: {stats['memories']}\n"
+        f"- Debugging Facts: {stats['facts']} (score >= {args.min_score:g})\n"
+        f"- Session Narratives: {stats['narratives']}\n"
+        f"- Crystallizations: {stats['crystallizations']}\n"
+        f"- Wisdom: {stats['wisdom']}\n\n"
+        f"Full context file: {context_path}\n\n"
+        f"### RLM Available\n"
+        f"For large context processing (>100K chars), use RLM:\n"
+        f"```python\n"
+        f"from rlm_runner import RLMRunner\n"
+        f"runner = RLMRunner()\n"
+        f"runner.load('{context_path}')\n"
+        f"```\n\n"
+        f"---\n\n"
+        f"{digest.rstrip()}"
+    )
+    return {'continue': True, 'systemMessage': message}
 
 
 def main():
     parser = argparse.ArgumentParser(description='Export mempheromone database for RLM')
     parser.add_argument('--output', '-o', default='/tmp/mempheromone_context.txt',
                         help='Output file path')
+    parser.add_argument('--index', default=None,
+                        help='Section index path (default: output path with .index.json)')
+    parser.add_argument('--digest', default=None,
+                        help='Also write the session-start digest to this path')
+    parser.add_argument('--hook', action='store_true',
+                        help='Print the SessionStart hook JSON instead of the stats line')
     parser.add_argument('--json', '-j', action='store_true',
                         help='Output as JSON instead of text')
     parser.add_argument('--memories', type=int, default=500,
@@ -287,102 +932,150 @@ def main():
                         help='Max debugging_facts to export')
     parser.add_argument('--min-score', type=float, default=10,
                         help='Minimum pheromone score for facts')
+    parser.add_argument('--recall', default=None, metavar='QUERY',
+                        help='Lead the context with the memories semantically closest to QUERY')
+    parser.add_argument('--recall-k', type=int, default=20,
+                        help='Number of --recall matches (default: 20)')
+    parser.add_argument('--jobs', type=int, default=EXPORT_JOBS,
+                        help=f'Concurrent section queries, one connection each '
+                             f'(default: {EXPORT_JOBS}; 1 = serial)')
+    parser.add_argument('--budget', type=int, default=None,
+                        help='Export only the best-ranked items that fit this size, '
+                             'across all sections (see --budget-unit)')
+    parser.add_argument('--budget-unit', choices=['chars', 'tokens'], default='chars',
+                        help=f'Unit of --budget; tokens are approximated as '
+                             f'{CHARS_PER_TOKEN} chars (default: chars)')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Re-export every section, ignoring the section cache')
     parser.add_argument('--quiet', '-q', action='store_true',
                         help='Suppress progress output')
 
     args = parser.parse_args()
+    if args.json and (args.hook or args.digest):
+        parser.error('--hook and --digest need the text output, not --json')
+
+    budget = None
+    if args.budget is not None:
+        budget = args.budget * (CHARS_PER_TOKEN if args.budget_unit == 'tokens' else 1)
+
+    # The section cache holds formatted text, so --json always exports in
+    # full; --budget packs across sections, so it bypasses the cache too
+    cache_path = None
+    if not (args.json or args.no_cache or budget is not None or EXPORT_CACHE_PATH.lower() in ('', 'off', '0', 'false')):
+        cache_path = Path(EXPORT_CACHE_PATH)
 
     if not args.quiet:
         print("Connecting to mempheromone database...")
 
+    started = time.perf_counter()
     conn = get_connection()
 
     try:
-        data = {}
-
-        if not args.quiet:
-            print("Exporting claude_memories...")
-        data['memories'] = export_claude_memories(conn, args.memories)
-
-        if not args.quiet:
-            print("Exporting debugging_facts...")
-        data['facts'] = export_debugging_facts(conn, args.min_score, args.facts)
-
-        if not args.quiet:
-            print("Exporting session_narratives...")
-        data['narratives'] = export_session_narratives(conn)
-
-        if not args.quiet:
-            print("Exporting crystallizations...")
-        data['crystallizations'] = export_crystallizations(conn)
+        begin_snapshot(conn)
+        cache, fingerprints = {}, {}
+        stale = EXPORT_SECTIONS
+        if cache_path:
+            cache = load_section_cache(cache_path)
+            fingerprints = section_fingerprints(conn, args)
+            stale = [
+                section for section in EXPORT_SECTIONS
+                if fingerprints.get(section.key) is None
+                or cache.get(section.key, {}).get('fingerprint') != fingerprints[section.key]
+            ]
+            if not args.quiet:
+                for section in EXPORT_SECTIONS:
+                    if section not in stale:
+                        print(f"Reused {section.label} (unchanged)")
 
-        if not args.quiet:
-            print("Exporting wisdom...")
-        data['wisdom'] = export_wisdom(conn)
-
-        if not args.quiet:
-            print("Exporting recent chat...")
-        data['chat'] = export_recent_chat(conn)
+        if budget is not None:
+            data = pack_sections(conn, args, budget, quiet=args.quiet)
+        else:
+            jobs = max(1, args.jobs)
+            data = export_sections(conn, args, stale, jobs=jobs, quiet=args.quiet)
+    finally:
+        conn.close()
 
-        if not args.quiet:
-            print("Exporting exocortex memories...")
-        data['exocortex'] = export_exocortex_memories(conn)
+    # Stream output to file
+    section_counts = {}
+    texts = {}
+    if args.json:
+        # Convert datetimes to strings for JSON
+        def serialize(obj):
+            if isinstance(obj, datetime):
+                return obj.isoformat()
+            return str(obj)
 
-        if not args.quiet:
-            print("Exporting memory boxes...")
-        data['membox'] = export_memory_boxes(conn)
+        with open(args.output, 'w') as f:
+            json.dump(data, f, default=serialize, indent=2)
+            output_size = f.tell()
+        for section in EXPORT_SECTIONS:
+            section_counts[section.key] = section_stats(section, data[section.key])
+    else:
+        with open(args.output, 'wb') as f:
+            writer = ContextWriter(f)
+            writer.begin()
+            for section in EXPORT_SECTIONS:
+                if section.key in data:
+                    rows = data[section.key]
+                    counts = section_stats(section, rows)
+                    text = writer.section(section.key, section.format(rows) if rows else (), counts)
+                    cache[section.key] = {
+                        'fingerprint': fingerprints.get(section.key),
+                        'text': text,
+                        'stats': counts,
+                    }
+                else:
+                    cached = cache[section.key]
+                    writer.section(section.key, [cached['text']] if cached['text'] else (), cached['stats'])
+                texts[section.key] = cache[section.key]['text']
+                section_counts[section.key] = cache[section.key]['stats']
+            writer.end()
+        output_size = writer.chars
 
-        # Format output
-        if args.json:
-            # Convert datetimes to strings for JSON
-            def serialize(obj):
-                if isinstance(obj, datetime):
-                    return obj.isoformat()
-                return str(obj)
+        write_index(Path(args.index or Path(args.output).with_suffix('.index.json')), args.output, writer)
+        if cache_path and stale:
+            save_section_cache(cache_path, cache)
 
-            output = json.dumps(data, default=serialize, indent=2)
-        else:
-            output = format_for_rlm(data)
+    stats = {}
+    for section in EXPORT_SECTIONS:
+        stats.update(section_counts[section.key])
+    stats.update({
+        'output_size': output_size,
+        'output_file': args.output,
+        'cached_sections': len(EXPORT_SECTIONS) - len(stale),
+        'budget': budget,
+        'export_seconds': round(time.perf_counter() - started, 3)
+    })
 
-        # Write to file
-        with open(args.output, 'w') as f:
-            f.write(output)
-
-        # Print stats
-        membox_data = data.get('membox', {})
-        stats = {
-            'memories': len(data['memories']),
-            'facts': len(data['facts']),
-            'narratives': len(data['narratives']),
-            'crystallizations': len(data['crystallizations']),
-            'wisdom': len(data['wisdom']),
-            'chat': len(data['chat']),
-            'exocortex': len(data['exocortex']),
-            'membox_boxes': len(membox_data.get('boxes', [])),
-            'membox_links': len(membox_data.get('links', [])),
-            'output_size': len(output),
-            'output_file': args.output
-        }
+    digest = None
+    if args.digest or args.hook:
+        digest = build_digest(texts, args.output, output_size)
+        if args.digest:
+            with open(args.digest, 'w') as f:
+                f.write(digest)
 
-        if not args.quiet:
-            print(f"\nExport complete:")
-            print(f"  Memories: {stats['memories']}")
-            print(f"  Facts: {stats['facts']}")
-            print(f"  Narratives: {stats['narratives']}")
-            print(f"  Crystallizations: {stats['crystallizations']}")
-            print(f"  Wisdom: {stats['wisdom']}")
-            print(f"  Chat: {stats['chat']}")
-            print(f"  Exocortex: {stats['exocortex']}")
-            print(f"  Membox: {stats['membox_boxes']} boxes, {stats['membox_links']} links")
-            print(f"  Output size: {stats['output_size']:,} chars")
-            print(f"  Written to: {args.output}")
+    if not args.quiet:
+        print(f"\nExport complete:")
+        print(f"  Memories: {stats['memories']}")
+        print(f"  Facts: {stats['facts']}")
+        print(f"  Narratives: {stats['narratives']}")
+        print(f"  Crystallizations: {stats['crystallizations']}")
+        print(f"  Wisdom: {stats['wisdom']}")
+        print(f"  Chat: {stats['chat']}")
+        print(f"  Exocortex: {stats['exocortex']}")
+        print(f"  Membox: {stats['membox_boxes']} boxes, {stats['membox_links']} links")
+        print(f"  Output size: {stats['output_size']:,} chars")
+        print(f"  Written to: {args.output}")
+        print(f"  Cached sections: {stats['cached_sections']}/{len(EXPORT_SECTIONS)}")
+        print(f"  Took: {stats['export_seconds']:.2f}s")
 
+    if args.hook:
+        # SessionStart hook response, ready to pass through
+        print(json.dumps(hook_output(stats, args, digest)))
+    else:
         # Output stats as JSON for hook parsing
         print(json.dumps(stats))
 
-    finally:
-        conn.close()
-
 
 if __name__ == '__main__':
     main()
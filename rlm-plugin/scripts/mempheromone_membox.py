@@ -19,17 +19,31 @@ Usage:
     # Process new memories into topic-continuous boxes
     box = builder.add_memory(memory_type='debugging_fact', memory_id=uuid, content=text)
 
+    # Or a whole batch at once (one embedding call for the batch)
+    boxes = builder.add_memories([MemoryRecord('claude_memory', uuid, text, ts), ...])
+
     # Link boxes across discontinuities via shared events
     weaver = TraceWeaver()
     links = weaver.find_links(box_id)
+
+    # Semantic search over embedded memories and boxes
+    hits = recall("connection pool exhaustion", k=10)
 """
 
+import hashlib
+import io
+import itertools
 import json
 import logging
+import os
 import re
-from dataclasses import dataclass, field
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from uuid import UUID, uuid4
 
 import numpy as np
@@ -38,36 +52,51 @@ import psycopg2.extras
 from psycopg2.extras import RealDictCursor
 
 # Import from Speakeasy infrastructure
+from contextlib import contextmanager
+
 try:
     from connection_pool import get_connection, get_connection_with_commit
 except ImportError:
-    # Fallback for standalone use
-    import os
-    from contextlib import contextmanager
+    # Fallback for standalone use: a process-wide pool, so repeated
+    # get_connection() calls reuse sockets instead of reconnecting
     from dotenv import load_dotenv
+    from psycopg2.pool import ThreadedConnectionPool
     load_dotenv(os.path.expanduser("~/.god-mode-credentials"))
 
+    _pool = None
+
+    def _get_pool() -> ThreadedConnectionPool:
+        global _pool
+        if _pool is None:
+            _pool = ThreadedConnectionPool(
+                1, int(os.getenv("DB_POOL_MAX", "5")),
+                dbname=os.getenv("DB_NAME", "mempheromone"),
+                user=os.getenv("DB_USER", "ike"),
+                host=os.getenv("DB_HOST", ""),
+                port=os.getenv("DB_PORT", "5432")
+            )
+        return _pool
+
+    def _release(conn):
+        """Return a connection to the pool, dropping it if it is broken."""
+        try:
+            conn.rollback()  # never hand out a connection mid-transaction
+        except psycopg2.Error:
+            _get_pool().putconn(conn, close=True)
+        else:
+            _get_pool().putconn(conn)
+
     @contextmanager
     def get_connection():
-        conn = psycopg2.connect(
-            dbname=os.getenv("DB_NAME", "mempheromone"),
-            user=os.getenv("DB_USER", "ike"),
-            host=os.getenv("DB_HOST", ""),
-            port=os.getenv("DB_PORT", "5432")
-        )
+        conn = _get_pool().getconn()
         try:
             yield conn
         finally:
-            conn.close()
+            _release(conn)
 
     @contextmanager
     def get_connection_with_commit():
-        conn = psycopg2.connect(
-            dbname=os.getenv("DB_NAME", "mempheromone"),
-            user=os.getenv("DB_USER", "ike"),
-            host=os.getenv("DB_HOST", ""),
-            port=os.getenv("DB_PORT", "5432")
-        )
+        conn = _get_pool().getconn()
         try:
             yield conn
             conn.commit()
@@ -75,7 +104,54 @@ except ImportError:
             conn.rollback()
             raise
         finally:
-            conn.close()
+            _release(conn)
+
+
+@contextmanager
+def _use_connection(conn=None, commit: bool = False):
+    """Yield conn if the caller already holds one, else borrow one for the block."""
+    if conn is not None:
+        yield conn
+    elif commit:
+        with get_connection_with_commit() as borrowed:
+            yield borrowed
+    else:
+        with get_connection() as borrowed:
+            yield borrowed
+
+
+def iter_batches(iterable: Iterable, size: int) -> Iterator[List]:
+    """Yield lists of up to size items from any iterable, lazily."""
+    iterator = iter(iterable)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+@contextmanager
+def _savepoint(conn, name: str = 'membox_memory'):
+    """Scope a unit of work so its failure rolls back only that unit."""
+    with conn.cursor() as cur:
+        cur.execute(f"SAVEPOINT {name}")
+    try:
+        yield
+    except Exception:
+        with conn.cursor() as cur:
+            cur.execute(f"ROLLBACK TO SAVEPOINT {name}")
+        raise
+    else:
+        with conn.cursor() as cur:
+            cur.execute(f"RELEASE SAVEPOINT {name}")
+
+# File locking for the on-disk embedding cache (POSIX only)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+EMBEDDING_MODEL_NAME = 'all-MiniLM-L6-v2'
 
 # Optional: sentence-transformers for semantic similarity
 try:
@@ -86,7 +162,7 @@ try:
     def get_embedding_model():
         global _embedding_model
         if _embedding_model is None:
-            _embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
+            _embedding_model = SentenceTransformer(EMBEDDING_MODEL_NAME)
         return _embedding_model
 except ImportError:
     EMBEDDINGS_AVAILABLE = False
@@ -115,9 +191,38 @@ TOPIC_WINDOW_SIZE = 10
 # Lowered from 0.7 to 0.5 for more cross-topic links (2026-01-29)
 EVENT_LINK_THRESHOLD = 0.5
 
+# When the builder computes trace links:
+#   'flush'    - for the boxes touched by each bulk flush
+#   'deferred' - once per box at the end of a run (link_touched_boxes)
+LINK_MODES = ('flush', 'deferred')
+
 # Maximum events to extract per memory
 MAX_EVENTS_PER_MEMORY = 5
 
+# Keywords and events kept per box
+MAX_BOX_TERMS = 20
+
+# Content prefix fed to the embedding model (limit for speed)
+EMBEDDING_INPUT_CHARS = 1000
+
+# Sentences per forward pass when encoding a batch of memories
+EMBEDDING_BATCH_SIZE = 64
+
+# Rows fetched per round trip by server-side scan cursors
+SCAN_ITERSIZE = 2000
+
+# recall() fetches k * RECALL_OVERSAMPLE nearest neighbours before re-ranking
+RECALL_OVERSAMPLE = 4
+
+# Persistent embedding cache directory ('off' disables the cache)
+EMBEDDING_CACHE_DIR = os.getenv(
+    'MEMBOX_EMBEDDING_CACHE',
+    os.path.expanduser('~/.cache/mempheromone/embeddings')
+)
+
+# Vectors kept in the in-process LRU tier of the embedding cache
+EMBEDDING_CACHE_LRU_SIZE = 4096
+
 # Keywords extraction - common tech terms to identify
 TECH_KEYWORDS = {
     'python', 'javascript', 'typescript', 'rust', 'go', 'java', 'sql',
@@ -161,13 +266,645 @@ class TraceLink:
     linking_events: List[str]
 
 
-@dataclass
 class TopicSignature:
     """Extracted topic information from content."""
-    topic: str
-    keywords: List[str]
-    events: List[str]
-    embedding: Optional[np.ndarray] = None
+    __slots__ = ('topic', 'keywords', 'events', 'embedding', 'box_id')
+
+    def __init__(
+        self,
+        topic: str,
+        keywords: List[str],
+        events: List[str],
+        embedding: Optional[np.ndarray] = None,
+        box_id: Optional[UUID] = None
+    ):
+        self.topic = topic
+        self.keywords = keywords
+        self.events = events
+        self.embedding = embedding
+        self.box_id = box_id
+
+    def __repr__(self) -> str:
+        return (f"TopicSignature(topic={self.topic!r}, keywords={self.keywords!r}, "
+                f"events={self.events!r}, box_id={self.box_id!r})")
+
+
+class MemoryRecord(NamedTuple):
+    """A memory waiting to be placed into a box (see MemboxBuilder.add_memories)."""
+    memory_type: str
+    memory_id: UUID
+    content: str
+    timestamp: Optional[datetime] = None
+
+
+def _unit_vector(vector) -> Optional[np.ndarray]:
+    """Return vector scaled to unit length as float32, or None if it is all zeros."""
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    if not norm:
+        return None
+    return vector / norm
+
+
+# Set bits in an int bitset (int.bit_count needs Python 3.10)
+if hasattr(int, 'bit_count'):
+    def _popcount(bits: int) -> int:
+        return bits.bit_count()
+else:
+    def _popcount(bits: int) -> int:
+        return bin(bits).count('1')
+
+# Set bits per row of a uint64 bitset matrix (np.bitwise_count needs NumPy 2.0)
+if hasattr(np, 'bitwise_count'):
+    def _popcount_rows(masks: np.ndarray) -> np.ndarray:
+        return np.bitwise_count(masks).sum(axis=1, dtype=np.int64)
+else:
+    _BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+    def _popcount_rows(masks: np.ndarray) -> np.ndarray:
+        as_bytes = np.ascontiguousarray(masks).view(np.uint8).reshape(len(masks), -1)
+        return _BYTE_POPCOUNT[as_bytes].sum(axis=1, dtype=np.int64)
+
+
+def _vector_literal(vector: Optional[np.ndarray]) -> Optional[str]:
+    """Format an embedding as a pgvector text literal (use with %s::vector)."""
+    if vector is None:
+        return None
+    return '[' + ','.join(f'{x:.7g}' for x in np.asarray(vector, dtype=np.float32)) + ']'
+
+
+def _merge_terms(existing: Iterable[str], new: Iterable[str], limit: int = MAX_BOX_TERMS) -> List[str]:
+    """
+    Existing box keywords/events first, then unseen new ones in order,
+    up to limit. BoxWriter applies the same merge in SQL.
+    """
+    return list(dict.fromkeys(itertools.chain(existing, new)))[:limit]
+
+
+def _parse_vector(value) -> Optional[np.ndarray]:
+    """Parse a pgvector column value (text literal, list or array) into an array."""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = json.loads(value)
+    return np.asarray(value, dtype=np.float32)
+
+
+# =============================================================================
+# MEMORY TYPES - Source Table Registry
+# =============================================================================
+
+@dataclass(frozen=True)
+class MemoryTypeSpec:
+    """Where one memory type lives and how to read it."""
+    memory_type: str
+    table: str
+    id_column: str
+    content_template: str           # SQL expression; {t} is the table alias
+    created_column: str = 'created_at'
+    score_column: Optional[str] = None  # bootstrap filters on this (min_pheromone)
+
+    def content(self, alias: str) -> str:
+        return self.content_template.format(t=alias)
+
+
+MEMORY_TYPES: Dict[str, MemoryTypeSpec] = {spec.memory_type: spec for spec in (
+    MemoryTypeSpec('debugging_fact', 'debugging_facts', 'fact_id',
+                   "{t}.symptom || ': ' || {t}.solution",
+                   created_column='first_seen', score_column='pheromone_score'),
+    MemoryTypeSpec('claude_memory', 'claude_memories', 'id', '{t}.content'),
+    MemoryTypeSpec('crystallization', 'crystallization_events', 'id',
+                   'COALESCE({t}.understanding_as_crystallized, {t}.resolving_content)'),
+    MemoryTypeSpec('narrative', 'session_narratives', 'id', '{t}.narrative_text'),
+)}
+
+# Types the worker and bootstrap box by default
+DEFAULT_MEMORY_TYPES = ['debugging_fact', 'claude_memory', 'crystallization']
+
+
+def memory_stream_sql(
+    memory_types: Iterable[str],
+    where: Optional[Callable[[MemoryTypeSpec], str]] = None,
+    join: Optional[Callable[[MemoryTypeSpec], str]] = None,
+    newest: bool = False
+) -> str:
+    """
+    Build one UNION ALL query over several memory types that returns
+    (memory_type, memory_id, content, created_at) rows in chronological
+    order, at most %(limit)s of them in total.
+
+    where and join produce per-type SQL over the source table aliased
+    as src; they may use named parameters. Each branch is ordered and
+    limited on its own too, so Postgres can walk the created_at indexes
+    and merge. With newest=True the most recent rows are selected, still
+    returned oldest first. Unknown memory types are skipped with a warning.
+    """
+    direction = 'DESC' if newest else 'ASC'
+    branches = []
+    for memory_type in memory_types:
+        spec = MEMORY_TYPES.get(memory_type)
+        if spec is None:
+            logger.warning(f"Unknown memory type: {memory_type}")
+            continue
+        branches.append(f"""
+            (SELECT '{spec.memory_type}'::text AS memory_type,
+                    src.{spec.id_column} AS memory_id,
+                    {spec.content('src')} AS content,
+                    src.{spec.created_column} AS created_at
+             FROM {spec.table} src
+             {join(spec) if join else ''}
+             WHERE {where(spec) if where else 'TRUE'}
+             ORDER BY src.{spec.created_column} {direction}, src.{spec.id_column} {direction}
+             LIMIT %(limit)s)""")
+
+    if not branches:
+        raise ValueError(f"No known memory types in {list(memory_types)}")
+
+    query = (' UNION ALL '.join(branches)
+             + f"\n ORDER BY created_at {direction}, memory_id {direction} LIMIT %(limit)s")
+    if newest:
+        query = f"SELECT * FROM ({query}) AS newest ORDER BY created_at, memory_id"
+    return query
+
+
+def memory_join_sql(items: str) -> Tuple[str, str, str]:
+    """
+    Resolve memories referenced by a relation (alias items, with
+    memory_type and memory_id columns) against their source tables.
+
+    Returns (joins, content, score): LEFT JOINs of every registered
+    table, and CASE expressions for the content and the score column
+    (NULL for types without one).
+    """
+    joins, contents, scores = [], [], []
+    for spec in MEMORY_TYPES.values():
+        alias = f"m_{spec.memory_type}"
+        joins.append(
+            f"LEFT JOIN {spec.table} {alias} "
+            f"ON {items}.memory_type = '{spec.memory_type}' "
+            f"AND {alias}.{spec.id_column} = {items}.memory_id"
+        )
+        contents.append(f"WHEN '{spec.memory_type}' THEN {spec.content(alias)}")
+        if spec.score_column:
+            scores.append(f"WHEN '{spec.memory_type}' THEN {alias}.{spec.score_column}")
+    score = f"CASE {items}.memory_type {' '.join(scores)} END" if scores else 'NULL'
+    return (' '.join(joins),
+            f"CASE {items}.memory_type {' '.join(contents)} END",
+            score)
+
+
+def stream_memories(
+    query: str,
+    params: Dict[str, Any],
+    cursor_name: str,
+    itersize: int = SCAN_ITERSIZE
+) -> Iterator[MemoryRecord]:
+    """
+    Run a memory_stream_sql() query through a named (server-side) cursor
+    and yield MemoryRecord tuples, itersize rows per round trip.
+    """
+    with get_connection() as conn:
+        with conn.cursor(name=cursor_name) as cur:
+            cur.itersize = itersize
+            cur.execute(query, params)
+            for row in cur:
+                yield MemoryRecord._make(row)
+
+
+# =============================================================================
+# EMBEDDING CACHE - Content-Addressed Vectors
+# =============================================================================
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache keyed by model name and normalized content.
+
+    Two tiers: an in-process LRU of recently used vectors, backed by an
+    append-only store in one directory per model:
+
+        vectors.f32  float32 rows, memory-mapped for reads
+        index.bin    16-byte content digests; entry i keys vector row i
+
+    Rows are only ever appended. A vector row is written before its index
+    entry, so a crash can leave at most an orphaned vector or a partial
+    digest, which the next writer truncates away; readers ignore both.
+    """
+
+    DIGEST_SIZE = 16
+
+    def __init__(
+        self,
+        model_name: str,
+        dimension: int,
+        cache_dir: str = EMBEDDING_CACHE_DIR,
+        lru_size: int = EMBEDDING_CACHE_LRU_SIZE
+    ):
+        self.model_name = model_name
+        self.dimension = dimension
+        self.lru_size = lru_size
+        self.row_bytes = dimension * 4
+
+        self.directory = Path(cache_dir) / re.sub(r'[^A-Za-z0-9_.-]', '_', model_name)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.vectors_path = self.directory / 'vectors.f32'
+        self.index_path = self.directory / 'index.bin'
+
+        self._rows: Dict[bytes, int] = {}
+        self._indexed_rows = 0
+        self._lru: 'OrderedDict[bytes, np.ndarray]' = OrderedDict()
+        self._mmap: Optional[np.ndarray] = None
+        self.hits = 0
+        self.misses = 0
+
+        self._load_index()
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Collapse whitespace; the tokenizer ignores it, so embeddings are unchanged."""
+        return ' '.join(text.split())
+
+    def _digest(self, normalized: str) -> bytes:
+        return hashlib.blake2b(
+            f"{self.model_name}\0{normalized}".encode('utf-8'),
+            digest_size=self.DIGEST_SIZE
+        ).digest()
+
+    def _load_index(self):
+        """Read index entries appended since the last load (by any process)."""
+        if not self.index_path.exists():
+            return
+        vector_rows = self.vectors_path.stat().st_size // self.row_bytes if self.vectors_path.exists() else 0
+        with open(self.index_path, 'rb') as index_file:
+            index_file.seek(self._indexed_rows * self.DIGEST_SIZE)
+            tail = index_file.read()
+        # Whole records only: a trailing partial digest is still being
+        # written, or was left by a crash and is truncated by put_many()
+        rows = min(self._indexed_rows + len(tail) // self.DIGEST_SIZE, vector_rows)
+        for row in range(self._indexed_rows, rows):
+            offset = (row - self._indexed_rows) * self.DIGEST_SIZE
+            self._rows[tail[offset:offset + self.DIGEST_SIZE]] = row
+        self._indexed_rows = max(rows, self._indexed_rows)
+
+    def _read_row(self, row: int) -> np.ndarray:
+        if self._mmap is None or row >= self._mmap.shape[0]:
+            rows = self.vectors_path.stat().st_size // self.row_bytes
+            self._mmap = np.memmap(self.vectors_path, dtype=np.float32, mode='r',
+                                   shape=(rows, self.dimension))
+        return np.array(self._mmap[row])
+
+    def _remember(self, digest: bytes, vector: np.ndarray):
+        self._lru[digest] = vector
+        self._lru.move_to_end(digest)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def get(self, normalized: str) -> Optional[np.ndarray]:
+        """Look up a normalized text, checking the LRU tier before disk."""
+        digest = self._digest(normalized)
+        vector = self._lru.get(digest)
+        if vector is None:
+            row = self._rows.get(digest)
+            if row is None:
+                return None
+            vector = self._read_row(row)
+        self._remember(digest, vector)
+        return vector
+
+    def put_many(self, normalized_texts: List[str], vectors: np.ndarray):
+        """Append new vectors to the on-disk store."""
+        digests = [self._digest(text) for text in normalized_texts]
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        if vectors.shape != (len(digests), self.dimension):
+            raise ValueError(
+                f"Expected {len(digests)} vectors of dimension {self.dimension}, "
+                f"got shape {vectors.shape}"
+            )
+
+        with open(self.index_path, 'ab') as index_file:
+            if fcntl:
+                fcntl.flock(index_file, fcntl.LOCK_EX)
+            try:
+                # Pick up rows other processes appended while we held no lock
+                self._load_index()
+
+                # Complete rows only: a crashed writer may have left an
+                # orphaned vector or a partial digest behind
+                vector_rows = (self.vectors_path.stat().st_size // self.row_bytes
+                               if self.vectors_path.exists() else 0)
+                row = min(self.index_path.stat().st_size // self.DIGEST_SIZE, vector_rows)
+                if row < self._indexed_rows:
+                    self._rows = {d: r for d, r in self._rows.items() if r < row}
+                    self._indexed_rows = row
+                index_file.truncate(row * self.DIGEST_SIZE)
+
+                with open(self.vectors_path, 'ab') as vectors_file:
+                    vectors_file.truncate(row * self.row_bytes)
+                    vectors_file.write(vectors.tobytes())
+                index_file.write(b''.join(digests))
+                index_file.flush()
+            finally:
+                if fcntl:
+                    fcntl.flock(index_file, fcntl.LOCK_UN)
+
+        for offset, (digest, vector) in enumerate(zip(digests, vectors)):
+            self._rows[digest] = row + offset
+            self._remember(digest, vector)
+        self._indexed_rows = row + len(digests)
+
+    def encode(self, texts: List[str], model, batch_size: int = EMBEDDING_BATCH_SIZE) -> np.ndarray:
+        """Return embeddings for texts, encoding only the ones not cached yet."""
+        normalized = [self.normalize(text) for text in texts]
+        results: List[Optional[np.ndarray]] = [self.get(text) for text in normalized]
+
+        if any(vector is None for vector in results):
+            # Other workers may have cached these since we last looked
+            self._load_index()
+            results = [self.get(text) if vector is None else vector
+                       for text, vector in zip(normalized, results)]
+
+        missing = list(OrderedDict.fromkeys(
+            text for text, vector in zip(normalized, results) if vector is None
+        ))
+        self.hits += len(texts) - sum(1 for vector in results if vector is None)
+        self.misses += len(missing)
+
+        if missing:
+            encoded = np.asarray(model.encode(missing, batch_size=batch_size), dtype=np.float32)
+            self.put_many(missing, encoded)
+            fresh = dict(zip(missing, encoded))
+            results = [fresh[text] if vector is None else vector
+                       for text, vector in zip(normalized, results)]
+
+        return np.stack(results) if results else np.zeros((0, self.dimension), dtype=np.float32)
+
+
+_embedding_cache = None
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Shared embedding cache for the loaded model, or None if disabled/unavailable."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        model = get_embedding_model() if EMBEDDINGS_AVAILABLE else None
+        if model is None or EMBEDDING_CACHE_DIR.lower() in ('', 'off', '0', 'false'):
+            return None
+        try:
+            _embedding_cache = EmbeddingCache(
+                EMBEDDING_MODEL_NAME,
+                model.get_sentence_embedding_dimension()
+            )
+        except OSError as e:
+            logger.warning(f"Embedding cache disabled: {e}")
+            return None
+    return _embedding_cache
+
+
+def encode_texts(texts: List[str]) -> Optional[np.ndarray]:
+    """
+    Embed texts with the shared model, going through the embedding cache.
+
+    Returns None when no embedding model is available.
+    """
+    model = get_embedding_model() if EMBEDDINGS_AVAILABLE else None
+    if model is None:
+        return None
+    cache = get_embedding_cache()
+    if cache is not None:
+        return cache.encode(texts, model)
+    return np.asarray(model.encode(texts, batch_size=EMBEDDING_BATCH_SIZE), dtype=np.float32)
+
+
+# =============================================================================
+# EMBEDDING STORE - Bulk Ingestion into the embeddings Table
+# =============================================================================
+
+def _not_embedded(spec: MemoryTypeSpec) -> str:
+    """SQL condition: the memory has no embedding from %(model)s yet."""
+    return f"""NOT EXISTS (
+                SELECT 1 FROM embeddings e
+                WHERE e.memory_type = '{spec.memory_type}'
+                  AND e.memory_id = src.{spec.id_column}
+                  AND e.model = %(model)s
+            )"""
+
+
+def iter_unembedded_memories(
+    memory_types: Iterable[str],
+    since: Optional[datetime] = None,
+    limit: Optional[int] = None,
+    itersize: int = SCAN_ITERSIZE,
+    model_name: str = EMBEDDING_MODEL_NAME
+) -> Iterator[MemoryRecord]:
+    """
+    Stream memories (oldest first) that have no embedding from model_name,
+    including ones embedded by an older model. since bounds the scan by
+    creation time; limit=None means no limit.
+    """
+    def where(spec: MemoryTypeSpec) -> str:
+        conditions = [f"({spec.content('src')}) IS NOT NULL", _not_embedded(spec)]
+        if since is not None:
+            conditions.append(f"src.{spec.created_column} >= %(since)s")
+        return ' AND '.join(conditions)
+
+    query = memory_stream_sql(memory_types, where=where)
+    params = {'model': model_name, 'since': since, 'limit': limit}
+    return stream_memories(query, params, 'membox_unembedded', itersize)
+
+
+def store_embeddings(
+    conn,
+    records: List[MemoryRecord],
+    vectors: np.ndarray,
+    model_name: str = EMBEDDING_MODEL_NAME
+) -> int:
+    """
+    Bulk-load embeddings for records: COPY into a session-local staging
+    table, then one INSERT ... ON CONFLICT that replaces embeddings from
+    other models. Returns the number of rows written.
+    """
+    if not records:
+        return 0
+
+    buffer = io.StringIO()
+    for record, vector in zip(records, vectors):
+        buffer.write(f"{record.memory_type}\t{record.memory_id}\t{_vector_literal(vector)}\n")
+    buffer.seek(0)
+
+    with conn.cursor() as cur:
+        cur.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS membox_embedding_stage (
+                memory_type VARCHAR(50),
+                memory_id UUID,
+                embedding vector
+            ) ON COMMIT DELETE ROWS
+        """)
+        cur.execute("TRUNCATE membox_embedding_stage")
+        cur.copy_expert(
+            "COPY membox_embedding_stage (memory_type, memory_id, embedding) FROM STDIN",
+            buffer
+        )
+        cur.execute("""
+            INSERT INTO embeddings (memory_type, memory_id, embedding, model)
+            SELECT DISTINCT ON (memory_type, memory_id)
+                   memory_type, memory_id, embedding, %s
+            FROM membox_embedding_stage
+            ON CONFLICT (memory_type, memory_id) DO UPDATE
+            SET embedding = EXCLUDED.embedding,
+                model = EXCLUDED.model,
+                created_at = NOW()
+        """, (model_name,))
+        return cur.rowcount
+
+
+def embed_memories(
+    memory_types: Optional[Iterable[str]] = None,
+    since: Optional[datetime] = None,
+    limit: Optional[int] = None,
+    batch_size: int = EMBEDDING_BATCH_SIZE * 4,
+    itersize: int = SCAN_ITERSIZE
+) -> Dict[str, Any]:
+    """
+    Embed memories that have no embedding for the current model and
+    bulk-load them into the embeddings table, one commit per batch.
+
+    Texts go through encode_texts(), so memories the Topic Loom already
+    embedded are served from the embedding cache instead of the model.
+    """
+    memory_types = list(memory_types or MEMORY_TYPES)
+    stats = {'found': 0, 'embedded': 0, 'batches': 0, 'encode_seconds': 0.0}
+    if not EMBEDDINGS_AVAILABLE:
+        logger.warning("sentence-transformers not installed; skipping embedding ingestion")
+        return stats
+
+    memories = iter_unembedded_memories(memory_types, since, limit, itersize)
+    for batch in iter_batches(memories, batch_size):
+        stats['found'] += len(batch)
+        started = time.perf_counter()
+        vectors = encode_texts([record.content[:EMBEDDING_INPUT_CHARS] for record in batch])
+        stats['encode_seconds'] += time.perf_counter() - started
+        if vectors is None:
+            break
+
+        with get_connection_with_commit() as conn:
+            stats['embedded'] += store_embeddings(conn, batch, vectors)
+        stats['batches'] += 1
+        logger.info(f"Embedded batch {stats['batches']}: {stats['embedded']} memories so far")
+
+    return stats
+
+
+# =============================================================================
+# SIGNATURE EXTRACTION - Topic, Keywords, Events
+# =============================================================================
+
+# Event verb families, in output order. Each family contributes at most two
+# events, and matches of one family never overlap each other.
+EVENT_VERB_FAMILIES = (
+    ('fixed', 'fix', 'resolved', 'resolve'),
+    ('implemented', 'implement', 'added', 'add'),
+    ('created', 'create', 'built', 'build'),
+    ('updated', 'update', 'changed', 'change'),
+    ('deleted', 'delete', 'removed', 'remove'),
+    ('discovered', 'discover', 'found', 'find'),
+    ('configured', 'configure', 'setup', 'set up'),
+    ('debugged', 'debug', 'diagnosed', 'diagnose'),
+)
+
+
+class SignatureExtractor:
+    """
+    Extracts (topic, keywords, events) from content: everything in a
+    topic signature except the embedding.
+
+    Keyword hits and event phrases come out of one scan of the lowercased
+    content with a single precompiled alternation: an event verb whose
+    object is captured by a lookahead (so verbs inside another event's
+    object are still seen), or a whole-word keyword. Event verbs must
+    start a word; keywords are matched as whole words.
+
+    The extractor pickles by value, so it can be shipped to
+    ProcessPoolExecutor workers.
+    """
+
+    def __init__(
+        self,
+        keywords: Optional[Iterable[str]] = None,
+        verb_families: Tuple[Tuple[str, ...], ...] = EVENT_VERB_FAMILIES
+    ):
+        keywords = TECH_KEYWORDS if keywords is None else keywords
+        self.keywords = frozenset(k.strip().lower() for k in keywords if k.strip())
+        self.verb_families = tuple(tuple(verb.lower() for verb in family) for family in verb_families)
+        self._family_of_verb = {
+            verb: i for i, family in enumerate(self.verb_families) for verb in family
+        }
+
+        # Longest first, so 'fixed' wins over 'fix' at the same position
+        verbs = '|'.join(re.escape(v) for v in sorted(self._family_of_verb, key=len, reverse=True))
+        pattern = r'\b(?:(?P<verb>%s)(?=\s+(?P<object>[^.!?\n]+))' % verbs
+        if self.keywords:
+            pattern += r'|(?P<keyword>%s)\b' % '|'.join(
+                re.escape(k) for k in sorted(self.keywords, key=len, reverse=True)
+            )
+        pattern += ')'
+
+        self.pattern = re.compile(pattern)
+        # For text whose lowercase form changes length (offsets would not line up)
+        self._pattern_ignorecase = re.compile(pattern, re.IGNORECASE)
+
+    def __getstate__(self):
+        return {'keywords': self.keywords, 'verb_families': self.verb_families}
+
+    def __setstate__(self, state):
+        self.__init__(state['keywords'], state['verb_families'])
+
+    def extract(self, content: str) -> Tuple[str, List[str], List[str]]:
+        """Return (topic, keywords, events) for content."""
+        lower = content.lower()
+        if len(lower) == len(content):
+            matches = self.pattern.finditer(lower)
+        else:
+            matches = self._pattern_ignorecase.finditer(content)
+
+        keywords = set()
+        families = len(self.verb_families)
+        events: List[List[str]] = [[] for _ in range(families)]
+        taken = [0] * families       # matches used per family (max 2)
+        covered = [0] * families     # end of the family's last match
+
+        for match in matches:
+            verb = match.group('verb')
+            if verb is None:
+                keywords.add(match.group('keyword').lower())
+                continue
+
+            # The verb was consumed, so count it (or its words) as keywords too
+            verb = verb.lower()
+            for word in verb.split():
+                if word in self.keywords:
+                    keywords.add(word)
+
+            # Matches of one family never overlap, as with one findall per family
+            family = self._family_of_verb[verb]
+            if match.start() < covered[family]:
+                continue
+            start, end = match.span('object')
+            covered[family] = end
+
+            if taken[family] < 2:
+                taken[family] += 1
+                event = content[start:end].strip()[:80]
+                if event and len(event) > 5:
+                    events[family].append(event)
+
+        # Derive topic from first line
+        topic = content.strip().split('\n', 1)[0][:100]
+
+        # Sorted so the pick does not depend on the per-process string hash seed
+        return (
+            topic,
+            sorted(keywords)[:10],
+            [event for family in events for event in family][:MAX_EVENTS_PER_MEMORY]
+        )
 
 
 # =============================================================================
@@ -181,13 +918,49 @@ class TopicLoom:
     The Topic Loom maintains a window of recent topic signatures and
     determines if new content continues an existing topic or starts
     a new one. This enables topic-continuous memory grouping.
+
+    The window is a fixed-size ring buffer: embeddings are stored
+    pre-normalized in one preallocated matrix, so scoring a candidate
+    against the whole window is a single matrix-vector product. Keywords
+    are interned to bit positions and stored as one uint64 bitset row per
+    slot, so the Jaccard fallback (no embeddings) is a vectorized AND and
+    popcount over the window as well.
+
+    With workers > 1, the regex/keyword part of signature extraction is
+    fanned out over a process pool in ordered chunks; embedding and the
+    continuation decisions stay in this process.
     """
 
-    def __init__(self, window_size: int = TOPIC_WINDOW_SIZE):
+    def __init__(
+        self,
+        window_size: int = TOPIC_WINDOW_SIZE,
+        workers: int = 1,
+        extractor: Optional[SignatureExtractor] = None
+    ):
         self.window_size = window_size
-        self.topic_window: List[TopicSignature] = []
+        self.extractor = extractor or SignatureExtractor()
+        self.workers = max(1, workers or 1)
+        self._executor: Optional[ProcessPoolExecutor] = None
         self.model = get_embedding_model() if EMBEDDINGS_AVAILABLE else None
 
+        # Ring buffer state (slot = insertion index modulo window_size)
+        self._signatures: List[Optional[TopicSignature]] = [None] * window_size
+        self._keyword_bits: Dict[str, int] = {}
+        self._keyword_masks = np.zeros((window_size, 1), dtype=np.uint64)
+        self._keyword_counts = np.zeros(window_size, dtype=np.int64)
+        self._box_ids = np.empty(window_size, dtype=object)
+        self._has_vector = np.zeros(window_size, dtype=bool)
+        self._vectors: Optional[np.ndarray] = None
+        self._next_slot = 0
+        self._size = 0
+
+        if self.model:
+            self._allocate_vectors(self.model.get_sentence_embedding_dimension())
+
+        # Encode timing, read by the worker for its stats
+        self.last_encode_seconds = 0.0
+        self.total_encode_seconds = 0.0
+
     def extract_topic_signature(self, content: str) -> TopicSignature:
         """
         Extract topic, keywords, and events from content.
@@ -196,60 +969,63 @@ class TopicLoom:
         Original Membox uses LLM, but this approach is faster
         and doesn't require API calls.
         """
-        content_lower = content.lower()
-        words = set(re.findall(r'\b[a-z]+\b', content_lower))
+        return self.extract_topic_signatures([content])[0]
 
-        # Extract keywords (tech terms present in content)
-        keywords = list(words & TECH_KEYWORDS)[:10]
+    def extract_topic_signatures(self, contents: List[str]) -> List[TopicSignature]:
+        """
+        Extract signatures for a batch of contents.
 
-        # Extract events (action patterns)
-        events = self._extract_events(content)
+        Keywords and events are extracted per item (in the process pool
+        when workers > 1), but all embeddings are computed in a single
+        vectorized encode call.
+        """
+        signatures = [
+            TopicSignature(topic=topic, keywords=keywords, events=events)
+            for topic, keywords, events in self._map_signature_fields(contents)
+        ]
 
-        # Derive topic from first line or dominant keywords
-        lines = content.strip().split('\n')
-        topic = lines[0][:100] if lines else 'Unknown'
+        # Compute embeddings if available
+        self.last_encode_seconds = 0.0
+        if self.model and contents:
+            started = time.perf_counter()
+            embeddings = encode_texts([content[:EMBEDDING_INPUT_CHARS] for content in contents])
+            self.last_encode_seconds = time.perf_counter() - started
+            self.total_encode_seconds += self.last_encode_seconds
 
-        # Compute embedding if available
-        embedding = None
-        if self.model:
-            embedding = self.model.encode(content[:1000])  # Limit for speed
+            for signature, embedding in zip(signatures, embeddings):
+                signature.embedding = embedding
 
-        return TopicSignature(
-            topic=topic,
-            keywords=keywords,
-            events=events,
-            embedding=embedding
-        )
+        return signatures
 
-    def _extract_events(self, content: str) -> List[str]:
-        """
-        Extract event patterns from content.
+    def _map_signature_fields(self, contents: List[str]) -> List[Tuple[str, List[str], List[str]]]:
+        """self.extractor.extract over contents, in order."""
+        if self.workers == 1 or len(contents) < 2:
+            return [self.extractor.extract(content) for content in contents]
 
-        Events are action-oriented phrases that can link
-        related memories across topic boundaries.
-        """
-        events = []
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
 
-        # Common event patterns
-        patterns = [
-            r'(?:fixed|fix|resolved|resolve)\s+([^.!?\n]+)',
-            r'(?:implemented|implement|added|add)\s+([^.!?\n]+)',
-            r'(?:created|create|built|build)\s+([^.!?\n]+)',
-            r'(?:updated|update|changed|change)\s+([^.!?\n]+)',
-            r'(?:deleted|delete|removed|remove)\s+([^.!?\n]+)',
-            r'(?:discovered|discover|found|find)\s+([^.!?\n]+)',
-            r'(?:configured|configure|setup|set up)\s+([^.!?\n]+)',
-            r'(?:debugged|debug|diagnosed|diagnose)\s+([^.!?\n]+)',
-        ]
+        # A few chunks per worker balances uneven content lengths
+        chunksize = max(1, len(contents) // (self.workers * 4))
+        return list(self._executor.map(self.extractor.extract, contents, chunksize=chunksize))
 
-        for pattern in patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            for match in matches[:2]:  # Max 2 per pattern
-                event = match.strip()[:80]
-                if event and len(event) > 5:
-                    events.append(event)
+    def close(self):
+        """Shut down the extraction process pool, if one was started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    @property
+    def topic_window(self) -> List[TopicSignature]:
+        """Signatures currently in the window, oldest first."""
+        return [self._signatures[slot] for slot in self._slots_newest_first()][::-1]
 
-        return events[:MAX_EVENTS_PER_MEMORY]
+    def _slots_newest_first(self) -> List[int]:
+        """Ring buffer slots in the window, most recently added first."""
+        return [(self._next_slot - 1 - i) % self.window_size for i in range(self._size)]
+
+    def _allocate_vectors(self, dimension: int):
+        self._vectors = np.zeros((self.window_size, dimension), dtype=np.float32)
 
     def is_topic_continuation(
         self,
@@ -261,53 +1037,191 @@ class TopicLoom:
 
         Returns (is_continuation, matching_box_id if continuing)
         """
-        if not self.topic_window:
+        if not self._size:
             return False, None
 
         # Try embedding similarity first (most accurate)
-        if self.model and new_signature.embedding is not None:
-            best_score = 0.0
-            best_box = None
-
-            for sig in self.topic_window[-self.window_size:]:
-                if sig.embedding is not None:
-                    score = np.dot(new_signature.embedding, sig.embedding) / (
-                        np.linalg.norm(new_signature.embedding) *
-                        np.linalg.norm(sig.embedding)
-                    )
-                    if score > best_score:
-                        best_score = score
-                        best_box = getattr(sig, 'box_id', None)
-
-            if best_score >= threshold:
-                return True, best_box
-
-        # Fallback to keyword overlap
-        new_keywords = set(new_signature.keywords)
+        if (self.model and new_signature.embedding is not None
+                and self._vectors is not None and self._has_vector.any()):
+            query = _unit_vector(new_signature.embedding)
+            if query is not None:
+                # Empty slots are zero rows, so they score 0 and never win
+                scores = self._vectors @ query
+                best = int(np.argmax(scores))
+                if scores[best] >= threshold:
+                    return True, self._box_ids[best]
+
+        # Fallback to keyword overlap: the newest slot whose Jaccard passes
+        new_keywords = frozenset(new_signature.keywords)
         if new_keywords:
-            for sig in reversed(self.topic_window[-self.window_size:]):
-                sig_keywords = set(sig.keywords)
-                if sig_keywords:
-                    overlap = len(new_keywords & sig_keywords) / len(new_keywords | sig_keywords)
-                    if overlap >= threshold:
-                        return True, getattr(sig, 'box_id', None)
+            slots = np.array(self._slots_newest_first())
+            shared = _popcount_rows(self._keyword_masks[slots] & self._keyword_mask(new_keywords))
+            counts = self._keyword_counts[slots]
+            overlap = shared / (counts + len(new_keywords) - shared)
+            hits = np.flatnonzero((counts > 0) & (overlap >= threshold))
+            if hits.size:
+                return True, self._box_ids[slots[hits[0]]]
 
         return False, None
 
+    def _keyword_mask(self, keywords: Iterable[str], intern: bool = False) -> np.ndarray:
+        """
+        Bitset row for keywords. Keywords without a bit are left out
+        unless intern is set; they cannot overlap anything in the window.
+        """
+        if intern:
+            for keyword in keywords:
+                if keyword not in self._keyword_bits:
+                    self._keyword_bits[keyword] = len(self._keyword_bits)
+            words_needed = (len(self._keyword_bits) + 63) // 64
+            if words_needed > self._keyword_masks.shape[1]:
+                grown = np.zeros((self.window_size, words_needed * 2), dtype=np.uint64)
+                grown[:, :self._keyword_masks.shape[1]] = self._keyword_masks
+                self._keyword_masks = grown
+
+        mask = np.zeros(self._keyword_masks.shape[1], dtype=np.uint64)
+        for keyword in keywords:
+            bit = self._keyword_bits.get(keyword)
+            if bit is not None:
+                mask[bit >> 6] |= np.uint64(1 << (bit & 63))
+        return mask
+
+    def window_box_ids(self) -> set:
+        """Ids of the boxes the window can currently route to."""
+        return {
+            self._box_ids[slot] for slot in self._slots_newest_first()
+            if self._box_ids[slot] is not None
+        }
+
+    def discard_box(self, box_id: UUID):
+        """Stop offering box_id as a continuation target (e.g. its write failed)."""
+        for slot in range(self.window_size):
+            if self._box_ids[slot] == box_id:
+                self._box_ids[slot] = None
+                self._keyword_masks[slot] = 0
+                self._keyword_counts[slot] = 0
+                self._has_vector[slot] = False
+                if self._vectors is not None:
+                    self._vectors[slot] = 0.0
+
     def add_to_window(self, signature: TopicSignature, box_id: UUID):
-        """Add a topic signature to the sliding window."""
+        """Add a topic signature to the sliding window, evicting the oldest."""
         signature.box_id = box_id
-        self.topic_window.append(signature)
+        slot = self._next_slot
+
+        self._signatures[slot] = signature
+        keywords = frozenset(signature.keywords)
+        self._keyword_masks[slot] = self._keyword_mask(keywords, intern=True)
+        self._keyword_counts[slot] = len(keywords)
+        self._box_ids[slot] = box_id
+
+        vector = _unit_vector(signature.embedding) if signature.embedding is not None else None
+        if vector is not None:
+            if self._vectors is None:
+                self._allocate_vectors(vector.shape[0])
+            self._vectors[slot] = vector
+            self._has_vector[slot] = True
+        else:
+            if self._vectors is not None:
+                self._vectors[slot] = 0.0
+            self._has_vector[slot] = False
 
-        # Trim window to size
-        if len(self.topic_window) > self.window_size * 2:
-            self.topic_window = self.topic_window[-self.window_size:]
+        self._next_slot = (slot + 1) % self.window_size
+        self._size = min(self._size + 1, self.window_size)
 
 
 # =============================================================================
 # TRACE WEAVER - Cross-Discontinuity Event Linking
 # =============================================================================
 
+class EventIndex:
+    """
+    In-process inverted index from event to the active boxes that carry it.
+
+    Loaded with one query per run and kept current as the builder
+    changes boxes, so link candidates are found without touching the
+    database. Event strings are interned to integer ids; overlaps with a
+    source box come back as bitsets over the source's own events, so
+    Jaccard needs only a popcount per candidate, not set algebra.
+    """
+
+    def __init__(self):
+        self.event_ids: Dict[str, int] = {}
+        self.postings: Dict[int, set] = {}
+        self.box_events: Dict[UUID, Tuple[str, ...]] = {}
+        self.box_event_ids: Dict[UUID, Tuple[int, ...]] = {}
+        self.box_scores: Dict[UUID, float] = {}
+        self.loaded = False
+        self._next_event_id = 0
+
+    def load(self, conn):
+        """Index every active box that has events."""
+        self.event_ids.clear()
+        self.postings.clear()
+        self.box_events.clear()
+        self.box_event_ids.clear()
+        self.box_scores.clear()
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT id, events, pheromone_score
+                FROM memory_boxes
+                WHERE is_active = TRUE
+                  AND cardinality(events) > 0
+            """)
+            for box_id, events, pheromone_score in cur.fetchall():
+                self.update_box(box_id, events, pheromone_score)
+        self.loaded = True
+        logger.info(f"Loaded event index: {len(self.box_events)} boxes, {len(self.postings)} events")
+
+    def update_box(self, box_id: UUID, events: List[str], pheromone_score: Optional[float] = None):
+        """Replace a box's events in the index."""
+        self.remove_box(box_id)
+        events = tuple(sorted(set(events or ())))
+        if not events:
+            return
+
+        event_ids = []
+        for event in events:
+            event_id = self.event_ids.get(event)
+            if event_id is None:
+                event_id = self.event_ids[event] = self._next_event_id
+                self._next_event_id += 1
+            event_ids.append(event_id)
+            self.postings.setdefault(event_id, set()).add(box_id)
+
+        self.box_events[box_id] = events
+        self.box_event_ids[box_id] = tuple(event_ids)
+        self.box_scores[box_id] = pheromone_score or 0.0
+
+    def remove_box(self, box_id: UUID):
+        events = self.box_events.pop(box_id, ())
+        for event, event_id in zip(events, self.box_event_ids.pop(box_id, ())):
+            boxes = self.postings.get(event_id)
+            if boxes is not None:
+                boxes.discard(box_id)
+                if not boxes:
+                    del self.postings[event_id]
+                    del self.event_ids[event]
+        self.box_scores.pop(box_id, None)
+
+    def overlaps(self, box_id: UUID) -> Dict[UUID, int]:
+        """
+        Boxes sharing at least one event with box_id, each mapped to a
+        bitset whose bit i is set when it shares box_events[box_id][i].
+        """
+        masks: Dict[UUID, int] = {}
+        for i, event_id in enumerate(self.box_event_ids.get(box_id, ())):
+            bit = 1 << i
+            for other in self.postings[event_id]:
+                masks[other] = masks.get(other, 0) | bit
+        masks.pop(box_id, None)
+        return masks
+
+    def candidates(self, box_id: UUID) -> set:
+        """Boxes sharing at least one event with box_id."""
+        return set(self.overlaps(box_id))
+
+
 class TraceWeaver:
     """
     Implements cross-discontinuity event linking.
@@ -321,88 +1235,272 @@ class TraceWeaver:
     def __init__(self, similarity_threshold: float = EVENT_LINK_THRESHOLD):
         self.similarity_threshold = similarity_threshold
         self.model = get_embedding_model() if EMBEDDINGS_AVAILABLE else None
+        self.index = EventIndex()
+
+    def load_index(self, conn=None):
+        """(Re)load the event index from the database."""
+        with _use_connection(conn) as conn:
+            self.index.load(conn)
 
     def find_links(
         self,
         box_id: UUID,
-        max_links: int = 10
+        max_links: int = 10,
+        conn=None
     ) -> List[TraceLink]:
         """
         Find boxes linked to the given box via shared events.
-        """
-        with get_connection() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Get source box events
-                cur.execute("""
-                    SELECT events FROM memory_boxes WHERE id = %s
-                """, (box_id,))
-                row = cur.fetchone()
-                if not row or not row['events']:
-                    return []
-
-                source_events = set(row['events'])
 
-                # Find boxes with overlapping events
-                cur.execute("""
-                    SELECT id, events, topic
-                    FROM memory_boxes
-                    WHERE id != %s
-                      AND is_active = TRUE
-                      AND events && %s  -- Array overlap operator
-                    ORDER BY pheromone_score DESC
-                    LIMIT %s
-                """, (box_id, list(source_events), max_links * 2))
+        Candidates and Jaccard scores come from the in-memory event index,
+        which is loaded on first use (on conn, if given).
+        """
+        if not self.index.loaded:
+            self.load_index(conn)
 
-                candidates = cur.fetchall()
+        source_events = self.index.box_events.get(box_id)
+        if not source_events:
+            return []
 
         links = []
-        for candidate in candidates:
-            target_events = set(candidate['events'])
-            common_events = source_events & target_events
+        for candidate_id, shared_bits in self.index.overlaps(box_id).items():
+            shared = _popcount(shared_bits)
+
+            # Jaccard similarity
+            union = len(source_events) + len(self.index.box_events[candidate_id]) - shared
+            similarity = shared / union
+
+            if similarity >= self.similarity_threshold or shared >= 2:
+                link = TraceLink(
+                    id=uuid4(),
+                    source_box_id=box_id,
+                    target_box_id=candidate_id,
+                    link_type='event_similarity',
+                    similarity_score=similarity,
+                    # source_events is sorted, so these are too
+                    linking_events=[
+                        event for i, event in enumerate(source_events)
+                        if shared_bits >> i & 1
+                    ]
+                )
+                links.append(link)
+
+        # Sort by similarity (stronger boxes first on ties) and limit
+        links.sort(
+            key=lambda x: (x.similarity_score, self.index.box_scores.get(x.target_box_id, 0.0)),
+            reverse=True
+        )
+        return links[:max_links]
 
-            if common_events:
-                # Jaccard similarity
-                similarity = len(common_events) / len(source_events | target_events)
+    def link_boxes(self, box_ids: Iterable[UUID], conn=None) -> Dict[str, int]:
+        """
+        Find and save links for several boxes, each linked once.
 
-                if similarity >= self.similarity_threshold or len(common_events) >= 2:
-                    link = TraceLink(
-                        id=uuid4(),
-                        source_box_id=box_id,
-                        target_box_id=candidate['id'],
-                        link_type='event_similarity',
-                        similarity_score=similarity,
-                        linking_events=list(common_events)
-                    )
-                    links.append(link)
+        Returns save_links() counts plus the number of boxes linked.
+        """
+        box_ids = list(dict.fromkeys(box_ids))
+        links = []
+        for box_id in box_ids:
+            links.extend(self.find_links(box_id, conn=conn))
+        counts = self.save_links(links, conn=conn)
+        counts['boxes'] = len(box_ids)
+        return counts
 
-        # Sort by similarity and limit
-        links.sort(key=lambda x: x.similarity_score, reverse=True)
-        return links[:max_links]
+    def save_links(self, links: List[TraceLink], conn=None) -> Dict[str, int]:
+        """
+        Persist trace links to database in one multi-row upsert.
 
-    def save_links(self, links: List[TraceLink]):
-        """Persist trace links to database."""
-        if not links:
-            return
+        Returns counts of links that were newly 'inserted' and existing
+        links that were 'updated'.
+        """
+        # One row per (source, target): ON CONFLICT cannot touch a row twice
+        unique = {(link.source_box_id, link.target_box_id): link for link in links}
+        if not unique:
+            return {'inserted': 0, 'updated': 0}
 
-        with get_connection_with_commit() as conn:
+        with _use_connection(conn, commit=True) as conn:
             with conn.cursor() as cur:
-                for link in links:
-                    cur.execute("""
-                        INSERT INTO trace_links
-                            (id, source_box_id, target_box_id, link_type,
-                             similarity_score, linking_events)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (source_box_id, target_box_id) DO UPDATE
-                        SET similarity_score = EXCLUDED.similarity_score,
-                            linking_events = EXCLUDED.linking_events
-                    """, (
+                rows = psycopg2.extras.execute_values(cur, """
+                    INSERT INTO trace_links
+                        (id, source_box_id, target_box_id, link_type,
+                         similarity_score, linking_events)
+                    VALUES %s
+                    ON CONFLICT (source_box_id, target_box_id) DO UPDATE
+                    SET similarity_score = EXCLUDED.similarity_score,
+                        linking_events = EXCLUDED.linking_events
+                    RETURNING (xmax = 0) AS inserted
+                """, [
+                    (
                         link.id,
                         link.source_box_id,
                         link.target_box_id,
                         link.link_type,
                         link.similarity_score,
                         link.linking_events
-                    ))
+                    )
+                    for link in unique.values()
+                ], template="(%s, %s, %s, %s, %s, %s::text[])", page_size=len(unique), fetch=True)
+
+        inserted = sum(1 for (was_inserted,) in rows if was_inserted)
+        return {'inserted': inserted, 'updated': len(rows) - inserted}
+
+
+# =============================================================================
+# BOX WRITER - Buffered Bulk Persistence
+# =============================================================================
+
+@dataclass
+class PendingBoxWrite:
+    """One memory's placement, waiting to be flushed."""
+    record: MemoryRecord
+    box: MemoryBox            # box state right after this memory was added
+    created: bool             # this memory started the box
+    centroid: Optional[np.ndarray]
+    centroid_count: int
+
+
+class BoxWriter:
+    """
+    Buffers box inserts, box updates and memory_box_items rows, and
+    writes them with one execute_values statement per kind.
+
+    Placements are aggregated per box: a box started in the buffer is
+    inserted once with its final state, and an existing box gets a single
+    UPDATE with merged keywords/events and count/pheromone deltas. If the
+    bulk write fails, each placement is replayed on its own savepoint so
+    one bad row only costs its own memory.
+
+    Several worker processes may extend the same box concurrently, so
+    existing boxes are locked with a transaction-scoped advisory lock and
+    everything that depends on their stored state (item positions, merged
+    keywords/events, counts) is computed in SQL under that lock rather
+    than from this process's possibly stale copy. The centroid is the one
+    exception: it is last-writer-wins, which only costs some precision in
+    a warm-start hint.
+    """
+
+    def __init__(self):
+        self.pending: List[PendingBoxWrite] = []
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def add(self, write: PendingBoxWrite):
+        self.pending.append(write)
+
+    def flush(self, conn) -> Tuple[List[PendingBoxWrite], List[PendingBoxWrite]]:
+        """
+        Write everything buffered on conn (the caller commits).
+
+        Returns (written, failed) placements.
+        """
+        pending, self.pending = self.pending, []
+        if not pending:
+            return [], []
+
+        try:
+            with _savepoint(conn, 'membox_flush'):
+                self._write(conn, pending)
+            return pending, []
+        except Exception as e:
+            logger.warning(f"Bulk box flush failed ({e}); retrying {len(pending)} memories one by one")
+
+        written, failed = [], []
+        for write in pending:
+            try:
+                with _savepoint(conn):
+                    self._write(conn, [write])
+                written.append(write)
+            except Exception as e:
+                logger.error(f"Failed to add {write.record.memory_type} {write.record.memory_id}: {e}")
+                failed.append(write)
+        return written, failed
+
+    @staticmethod
+    def _write(conn, writes: List[PendingBoxWrite]):
+        # Group placements per box, keeping first-seen order
+        groups: Dict[UUID, List[PendingBoxWrite]] = {}
+        for write in writes:
+            groups.setdefault(write.box.id, []).append(write)
+
+        new_boxes, box_updates, items = [], [], []
+        for box_id, group in groups.items():
+            # Offset within this write; the base is the box's stored MAX(position)
+            items.extend(
+                (box_id, write.record.memory_type, write.record.memory_id, offset)
+                for offset, write in enumerate(group, start=1)
+            )
+
+            final = group[-1]
+            box = final.box
+            if group[0].created:
+                new_boxes.append((
+                    box_id, box.topic, box.keywords, box.events, len(group),
+                    box.start_time, box.end_time, 10.0 + 0.5 * (len(group) - 1),
+                    _vector_literal(final.centroid), final.centroid_count
+                ))
+            else:
+                box_updates.append((
+                    box_id, box.keywords, box.events, len(group), box.end_time,
+                    _vector_literal(final.centroid), final.centroid_count
+                ))
+
+        with conn.cursor() as cur:
+            if box_updates:
+                # Serialize writers per box until commit; sorted to avoid deadlocks
+                cur.execute("""
+                    SELECT pg_advisory_xact_lock(hashtextextended(box_id::text, 0))
+                    FROM unnest(%s::uuid[]) AS box_id
+                    ORDER BY box_id
+                """, ([str(update[0]) for update in box_updates],))
+
+            if new_boxes:
+                psycopg2.extras.execute_values(cur, """
+                    INSERT INTO memory_boxes
+                        (id, topic, keywords, events, memory_count,
+                         start_time, end_time, pheromone_score,
+                         centroid, centroid_count)
+                    VALUES %s
+                """, new_boxes,
+                    template="(%s, %s, %s::text[], %s::text[], %s, %s, %s, %s, %s::vector, %s)")
+
+            if box_updates:
+                psycopg2.extras.execute_values(cur, f"""
+                    UPDATE memory_boxes mb
+                    SET keywords = ARRAY(
+                            SELECT k
+                            FROM unnest(COALESCE(mb.keywords, '{{}}') || v.keywords)
+                                 WITH ORDINALITY AS t(k, n)
+                            GROUP BY k ORDER BY MIN(n)
+                            LIMIT {MAX_BOX_TERMS}),
+                        events = ARRAY(
+                            SELECT e
+                            FROM unnest(COALESCE(mb.events, '{{}}') || v.events)
+                                 WITH ORDINALITY AS t(e, n)
+                            GROUP BY e ORDER BY MIN(n)
+                            LIMIT {MAX_BOX_TERMS}),
+                        memory_count = mb.memory_count + v.added,
+                        end_time = GREATEST(mb.end_time, v.end_time),
+                        updated_at = NOW(),
+                        pheromone_score = mb.pheromone_score + 0.5 * v.added,
+                        centroid = COALESCE(v.centroid, mb.centroid),
+                        centroid_count = v.centroid_count
+                    FROM (VALUES %s) AS v(id, keywords, events, added, end_time,
+                                          centroid, centroid_count)
+                    WHERE mb.id = v.id
+                """, box_updates,
+                    template="(%s::uuid, %s::text[], %s::text[], %s, %s, %s::vector, %s)")
+
+            psycopg2.extras.execute_values(cur, """
+                INSERT INTO memory_box_items
+                    (box_id, memory_type, memory_id, position)
+                SELECT v.box_id, v.memory_type, v.memory_id,
+                       COALESCE((SELECT MAX(mbi.position)
+                                 FROM memory_box_items mbi
+                                 WHERE mbi.box_id = v.box_id), 0) + v.position_offset
+                FROM (VALUES %s) AS v(box_id, memory_type, memory_id, position_offset)
+            """, items, template="(%s::uuid, %s, %s::uuid, %s)",
+                # One statement: MAX(position) must not see rows from earlier pages
+                page_size=len(items))
 
 
 # =============================================================================
@@ -421,40 +1519,138 @@ class MemboxBuilder:
         self,
         topic_window_size: int = TOPIC_WINDOW_SIZE,
         continuation_threshold: float = TOPIC_CONTINUATION_THRESHOLD,
-        link_threshold: float = EVENT_LINK_THRESHOLD
+        link_threshold: float = EVENT_LINK_THRESHOLD,
+        flush_every: int = 500,
+        link_mode: str = 'flush',
+        workers: int = 1,
+        keywords: Optional[Iterable[str]] = None
     ):
-        self.loom = TopicLoom(window_size=topic_window_size)
+        if link_mode not in LINK_MODES:
+            raise ValueError(f"Unknown link mode: {link_mode} (use {', '.join(LINK_MODES)})")
+
+        # workers > 1 extracts signatures in a process pool (see TopicLoom);
+        # keywords replaces the default TECH_KEYWORDS vocabulary
+        self.loom = TopicLoom(
+            window_size=topic_window_size,
+            workers=workers,
+            extractor=SignatureExtractor(keywords)
+        )
         self.loom_threshold = continuation_threshold
         self.weaver = TraceWeaver(similarity_threshold=link_threshold)
         self.current_box_id: Optional[UUID] = None
 
+        # Running centroid (mean embedding, member count) per box seen this run
+        self.box_centroids: Dict[UUID, Tuple[np.ndarray, int]] = {}
+
+        # In-memory state of every box the loom can route to, so placing a
+        # memory needs no reads; writes are buffered and flushed in bulk
+        self.boxes: Dict[UUID, MemoryBox] = {}
+        self.writer = BoxWriter()
+        self.flush_every = flush_every
+
+        # Boxes written since the last linking pass (deferred link mode)
+        self.link_mode = link_mode
+        self.touched_boxes: Dict[UUID, None] = {}
+
+        # Connection held by an open session() block, shared by all writes
+        self._session_conn = None
+
         # Load recent boxes into topic window
         self._load_recent_boxes()
 
-    def _load_recent_boxes(self, limit: int = 20):
-        """Load recent active boxes into topic window for continuity."""
+    # Box columns needed to rebuild in-memory state
+    _BOX_STATE_COLUMNS = """
+        mb.id, mb.topic, mb.keywords, mb.events, mb.summary,
+        mb.memory_count, mb.pheromone_score, mb.start_time, mb.end_time,
+        mb.centroid::text AS centroid, mb.centroid_count
+    """
+
+    def _remember_box(self, row: Dict) -> MemoryBox:
+        """Cache a memory_boxes row (selected with _BOX_STATE_COLUMNS)."""
+        box = MemoryBox(
+            id=row['id'],
+            topic=row['topic'],
+            keywords=row['keywords'] or [],
+            events=row['events'] or [],
+            summary=row['summary'],
+            memory_count=row['memory_count'] or 0,
+            pheromone_score=row['pheromone_score'],
+            start_time=row['start_time'],
+            end_time=row['end_time']
+        )
+        self.boxes[box.id] = box
+
+        centroid = _parse_vector(row['centroid'])
+        if centroid is not None:
+            self.box_centroids[box.id] = (centroid, row['centroid_count'] or 1)
+        return box
+
+    def _load_recent_boxes(self, limit: Optional[int] = None):
+        """
+        Load recent active boxes into topic window for continuity.
+
+        Box state and centroids come along in the same query, so a fresh
+        process makes embedding-based continuation decisions from the start
+        and can extend these boxes without reading them again.
+        """
+        limit = limit or self.loom.window_size
         try:
             with get_connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                    cur.execute("""
-                        SELECT id, topic, keywords, events
-                        FROM memory_boxes
-                        WHERE is_active = TRUE
-                        ORDER BY updated_at DESC
+                    cur.execute(f"""
+                        SELECT {self._BOX_STATE_COLUMNS}
+                        FROM memory_boxes mb
+                        WHERE mb.is_active = TRUE
+                        ORDER BY mb.updated_at DESC
                         LIMIT %s
                     """, (limit,))
 
-                    for row in cur.fetchall():
+                    # Oldest first, so the most recent box ends up newest in the window
+                    for row in reversed(cur.fetchall()):
+                        box = self._remember_box(row)
                         sig = TopicSignature(
-                            topic=row['topic'],
-                            keywords=row['keywords'] or [],
-                            events=row['events'] or []
+                            topic=box.topic,
+                            keywords=box.keywords,
+                            events=box.events,
+                            embedding=_parse_vector(row['centroid'])
                         )
-                        sig.box_id = row['id']
-                        self.loom.topic_window.append(sig)
+                        self.loom.add_to_window(sig, box.id)
         except Exception as e:
             logger.warning(f"Failed to load recent boxes: {e}")
 
+    def _load_box(self, box_id: UUID) -> Optional[MemoryBox]:
+        """Read one active box into the in-memory state (cache miss path)."""
+        with _use_connection(self._session_conn) as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(f"""
+                    SELECT {self._BOX_STATE_COLUMNS}
+                    FROM memory_boxes mb
+                    WHERE mb.id = %s AND mb.is_active = TRUE
+                """, (box_id,))
+                row = cur.fetchone()
+        return self._remember_box(row) if row else None
+
+    @contextmanager
+    def session(self):
+        """
+        Run builder calls on one connection and one transaction.
+
+        Box writes and trace link queries inside the block share the
+        connection; buffered writes are flushed and committed when the
+        outermost session block exits. Nested calls reuse the open session.
+        """
+        if self._session_conn is not None:
+            yield self._session_conn
+            return
+
+        with get_connection_with_commit() as conn:
+            self._session_conn = conn
+            try:
+                yield conn
+                self.flush()
+            finally:
+                self._session_conn = None
+
     def add_memory(
         self,
         memory_type: str,
@@ -475,10 +1671,166 @@ class MemboxBuilder:
         Returns:
             The MemoryBox the memory was added to
         """
-        timestamp = timestamp or datetime.now()
-
-        # Extract topic signature
+        record = MemoryRecord(memory_type, memory_id, content, timestamp)
         signature = self.loom.extract_topic_signature(content)
+        with self.session():
+            box = self._place_memory(record, signature)
+            failed = self.flush()
+        if failed:
+            raise RuntimeError(f"Failed to write {memory_type} {memory_id} to membox")
+        return box
+
+    def add_memories(self, records: Iterable[MemoryRecord]) -> List[Optional[MemoryBox]]:
+        """
+        Add a batch of memories, in order.
+
+        Signatures (including embeddings) are extracted for the whole
+        batch in one call, then each memory goes through the Topic Loom
+        decision sequentially so continuity matches add_memory().
+
+        Placements are buffered and flushed in bulk every flush_every
+        memories and at the end of the batch, all on one session
+        connection. A memory whose write fails is rolled back on its own
+        savepoint without aborting the others.
+
+        Args:
+            records: MemoryRecord tuples (memory_type, memory_id, content, timestamp)
+
+        Returns:
+            One entry per record: the MemoryBox it was added to, or None
+            if the memory could not be processed (the error is logged)
+        """
+        records = [MemoryRecord(*record) for record in records]
+        results: List[Optional[MemoryBox]] = [None] * len(records)
+
+        valid = []
+        for i, record in enumerate(records):
+            if record.content:
+                valid.append(i)
+            else:
+                logger.warning(f"Skipping {record.memory_type} {record.memory_id}: no content")
+
+        signatures = self.loom.extract_topic_signatures(
+            [records[i].content for i in valid]
+        )
+
+        failed = set()
+        with self.session():
+            for i, signature in zip(valid, signatures):
+                record = records[i]
+                try:
+                    results[i] = self._place_memory(record, signature)
+                except Exception as e:
+                    logger.error(f"Failed to add {record.memory_type} {record.memory_id}: {e}")
+
+                if len(self.writer) >= self.flush_every:
+                    failed.update(self.flush())
+            failed.update(self.flush())
+
+        if failed:
+            for i, record in enumerate(records):
+                if (record.memory_type, record.memory_id) in failed:
+                    results[i] = None
+
+        return results
+
+    def flush(self) -> set:
+        """
+        Write buffered placements and their trace links.
+
+        Returns the (memory_type, memory_id) keys of memories whose write
+        failed; those were rolled back and are not in any box. Their boxes
+        leave the topic window either way: a box whose creation failed does
+        not exist, and one whose extension failed may have been deleted or
+        deactivated, and its cached state no longer matches the database.
+        """
+        if not len(self.writer):
+            return set()
+
+        with _use_connection(self._session_conn, commit=True) as conn:
+            written, failed = self.writer.flush(conn)
+
+            uncreated = set()
+            for write in failed:
+                if write.created:
+                    uncreated.add(write.box.id)
+                self._forget_box(write.box.id, stored=not write.created)
+
+            for write in written:
+                if write.box.id not in uncreated:
+                    self.touched_boxes[write.box.id] = None
+
+            # In flush mode, link each touched box once per flush
+            if self.link_mode == 'flush':
+                self.link_touched_boxes(conn=conn)
+
+        return {(w.record.memory_type, w.record.memory_id) for w in failed}
+
+    def link_touched_boxes(self, conn=None) -> Dict[str, int]:
+        """
+        Compute and save trace links for every box written since the
+        last linking pass, once per box.
+
+        In deferred link mode, call this at the end of a run.
+        """
+        touched = list(self.touched_boxes)
+        if not touched:
+            return {'inserted': 0, 'updated': 0, 'boxes': 0}
+
+        counts = {'inserted': 0, 'updated': 0, 'boxes': len(touched)}
+        with _use_connection(conn or self._session_conn, commit=True) as conn:
+            try:
+                with _savepoint(conn, 'membox_links'):
+                    counts = self.weaver.link_boxes(touched, conn=conn)
+                logger.info(
+                    f"Trace links for {len(touched)} boxes: "
+                    f"{counts['inserted']} inserted, {counts['updated']} updated"
+                )
+            except Exception as e:
+                logger.warning(f"Failed to link {len(touched)} boxes: {e}")
+
+        self.touched_boxes.clear()
+        return counts
+
+    def evict_idle_boxes(self) -> int:
+        """
+        Drop in-memory state for boxes that have left the topic window.
+
+        Only window boxes can be extended without a read, so the rest is
+        dead weight in a long-running process; a box that comes back is
+        reloaded by _load_box(). Does nothing while writes are pending.
+
+        Returns:
+            Number of boxes evicted
+        """
+        if len(self.writer):
+            return 0
+
+        keep = self.loom.window_box_ids()
+        idle = [box_id for box_id in self.boxes if box_id not in keep]
+        for box_id in idle:
+            self.boxes.pop(box_id, None)
+            self.box_centroids.pop(box_id, None)
+        return len(idle)
+
+    def _forget_box(self, box_id: UUID, stored: bool = False):
+        """
+        Drop a box whose write was rolled back from the in-memory state.
+
+        A stored box (only its extension failed) keeps its event index
+        entry and is reloaded by _load_box() if it is routed to again.
+        """
+        self.boxes.pop(box_id, None)
+        self.box_centroids.pop(box_id, None)
+        self.loom.discard_box(box_id)
+        if not stored:
+            self.weaver.index.remove_box(box_id)
+        if self.current_box_id == box_id:
+            self.current_box_id = None
+
+    def _place_memory(self, record: MemoryRecord, signature: TopicSignature) -> MemoryBox:
+        """Run the Topic Loom decision for one memory and buffer its writes."""
+        timestamp = record.timestamp or datetime.now()
 
         # Check for topic continuation
         is_continuation, matching_box_id = self.loom.is_topic_continuation(
@@ -486,71 +1838,40 @@ class MemboxBuilder:
             threshold=self.loom_threshold
         )
 
+        box = None
         if is_continuation and matching_box_id:
+            box = self.boxes.get(matching_box_id) or self._load_box(matching_box_id)
+
+        if box is not None:
             # Add to existing box
-            box = self._add_to_existing_box(
-                matching_box_id, memory_type, memory_id,
-                signature, timestamp
-            )
+            created = False
+            box = self._extend_box(box, signature, timestamp)
         else:
             # Create new box
-            box = self._create_new_box(
-                memory_type, memory_id,
-                signature, timestamp
-            )
+            created = True
+            box = self._start_box(signature, timestamp)
 
-        # Update topic window
-        self.loom.add_to_window(signature, box.id)
-        self.current_box_id = box.id
+        centroid, centroid_count = self._update_centroid(box.id, signature.embedding)
 
-        # Find and save trace links (async-friendly, could be backgrounded)
-        links = self.weaver.find_links(box.id)
-        if links:
-            self.weaver.save_links(links)
-            logger.info(f"Created {len(links)} trace links for box {box.id}")
+        self.writer.add(PendingBoxWrite(
+            record=record,
+            box=replace(box),
+            created=created,
+            centroid=centroid,
+            centroid_count=centroid_count
+        ))
 
-        return box
-
-    def _create_new_box(
-        self,
-        memory_type: str,
-        memory_id: UUID,
-        signature: TopicSignature,
-        timestamp: datetime
-    ) -> MemoryBox:
-        """Create a new memory box."""
-        box_id = uuid4()
-
-        with get_connection_with_commit() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Create box
-                cur.execute("""
-                    INSERT INTO memory_boxes
-                        (id, topic, keywords, events, memory_count,
-                         start_time, end_time, pheromone_score)
-                    VALUES (%s, %s, %s, %s, 1, %s, %s, 10.0)
-                    RETURNING *
-                """, (
-                    box_id,
-                    signature.topic,
-                    signature.keywords,
-                    signature.events,
-                    timestamp,
-                    timestamp
-                ))
-                row = cur.fetchone()
-
-                # Link memory to box
-                cur.execute("""
-                    INSERT INTO memory_box_items
-                        (box_id, memory_type, memory_id, position)
-                    VALUES (%s, %s, %s, 1)
-                """, (box_id, memory_type, memory_id))
+        # Update topic window and event index
+        self.loom.add_to_window(signature, box.id)
+        self.weaver.index.update_box(box.id, box.events, box.pheromone_score)
+        self.current_box_id = box.id
 
-        logger.info(f"Created new memory box: {signature.topic[:50]}...")
+        return replace(box)
 
-        return MemoryBox(
-            id=box_id,
+    def _start_box(self, signature: TopicSignature, timestamp: datetime) -> MemoryBox:
+        """Create a new memory box (buffered)."""
+        box = MemoryBox(
+            id=uuid4(),
             topic=signature.topic,
             keywords=signature.keywords,
             events=signature.events,
@@ -558,71 +1879,44 @@ class MemboxBuilder:
             start_time=timestamp,
             end_time=timestamp
         )
+        self.boxes[box.id] = box
 
-    def _add_to_existing_box(
+        logger.info(f"Created new memory box: {signature.topic[:50]}...")
+        return box
+
+    def _extend_box(
         self,
-        box_id: UUID,
-        memory_type: str,
-        memory_id: UUID,
+        box: MemoryBox,
         signature: TopicSignature,
         timestamp: datetime
     ) -> MemoryBox:
-        """Add memory to an existing box."""
-        with get_connection_with_commit() as conn:
-            with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Get current box state
-                cur.execute("""
-                    SELECT * FROM memory_boxes WHERE id = %s
-                """, (box_id,))
-                box_row = cur.fetchone()
-
-                # Merge keywords and events
-                current_keywords = set(box_row['keywords'] or [])
-                current_events = set(box_row['events'] or [])
-
-                merged_keywords = list(current_keywords | set(signature.keywords))[:20]
-                merged_events = list(current_events | set(signature.events))[:20]
-
-                # Update box
-                cur.execute("""
-                    UPDATE memory_boxes
-                    SET keywords = %s,
-                        events = %s,
-                        memory_count = memory_count + 1,
-                        end_time = %s,
-                        updated_at = NOW(),
-                        pheromone_score = pheromone_score + 0.5
-                    WHERE id = %s
-                    RETURNING *
-                """, (merged_keywords, merged_events, timestamp, box_id))
-                updated_row = cur.fetchone()
-
-                # Get next position
-                cur.execute("""
-                    SELECT COALESCE(MAX(position), 0) + 1 as next_pos
-                    FROM memory_box_items WHERE box_id = %s
-                """, (box_id,))
-                next_pos = cur.fetchone()['next_pos']
+        """Add memory to an existing box (buffered)."""
+        # Merge keywords and events
+        box.keywords = _merge_terms(box.keywords, signature.keywords)
+        box.events = _merge_terms(box.events, signature.events)
+        box.memory_count += 1
+        box.pheromone_score += 0.5
+        box.end_time = timestamp
+
+        logger.info(f"Added memory to existing box: {box.topic[:50]}...")
+        return box
 
-                # Link memory to box
-                cur.execute("""
-                    INSERT INTO memory_box_items
-                        (box_id, memory_type, memory_id, position)
-                    VALUES (%s, %s, %s, %s)
-                """, (box_id, memory_type, memory_id, next_pos))
-
-        logger.info(f"Added memory to existing box: {box_row['topic'][:50]}...")
-
-        return MemoryBox(
-            id=box_id,
-            topic=updated_row['topic'],
-            keywords=merged_keywords,
-            events=merged_events,
-            memory_count=updated_row['memory_count'],
-            pheromone_score=updated_row['pheromone_score'],
-            start_time=updated_row['start_time'],
-            end_time=timestamp
-        )
+    def _update_centroid(
+        self,
+        box_id: UUID,
+        embedding: Optional[np.ndarray]
+    ) -> Tuple[Optional[np.ndarray], int]:
+        """Fold a member embedding into the box's running mean; returns (centroid, count)."""
+        centroid, count = self.box_centroids.get(box_id, (None, 0))
+        if embedding is not None:
+            embedding = np.asarray(embedding, dtype=np.float32)
+            if centroid is None or centroid.shape != embedding.shape:
+                centroid, count = embedding, 1
+            else:
+                centroid = centroid + (embedding - centroid) / (count + 1)
+                count += 1
+            self.box_centroids[box_id] = (centroid, count)
+        return centroid, count
 
     def get_box(self, box_id: UUID) -> Optional[MemoryBox]:
         """Get a memory box by ID."""
@@ -650,81 +1944,77 @@ class MemboxBuilder:
 
     def get_box_memories(self, box_id: UUID) -> List[Dict]:
         """Get all memories in a box with their content."""
+        return self.get_boxes_memories([box_id])[UUID(str(box_id))]
+
+    def get_boxes_memories(self, box_ids: Iterable[UUID]) -> Dict[UUID, List[Dict]]:
+        """
+        Get the memories of several boxes with their content, in one query.
+
+        Each memory type's source table is LEFT JOINed onto the box items,
+        so expanding any number of boxes costs a single round trip.
+        Returns box_id -> memories in box order; memories whose source
+        row is gone (or has no content) are skipped.
+        """
+        box_ids = list(dict.fromkeys(UUID(str(box_id)) for box_id in box_ids))
+        memories: Dict[UUID, List[Dict]] = {box_id: [] for box_id in box_ids}
+        if not box_ids:
+            return memories
+
+        joins, content, _ = memory_join_sql('mbi')
         with get_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT mbi.memory_type, mbi.memory_id, mbi.position
+                cur.execute(f"""
+                    SELECT mbi.box_id, mbi.memory_type, mbi.memory_id, mbi.position,
+                           {content} AS content
                     FROM memory_box_items mbi
-                    WHERE mbi.box_id = %s
-                    ORDER BY mbi.position
-                """, (box_id,))
-
-                items = cur.fetchall()
-                memories = []
-
-                for item in items:
-                    content = self._fetch_memory_content(
-                        cur, item['memory_type'], item['memory_id']
-                    )
-                    if content:
-                        memories.append({
-                            'type': item['memory_type'],
-                            'id': item['memory_id'],
-                            'position': item['position'],
-                            'content': content
+                    {joins}
+                    WHERE mbi.box_id = ANY(%s::uuid[])
+                    ORDER BY mbi.box_id, mbi.position
+                """, ([str(box_id) for box_id in box_ids],))
+
+                for row in cur:
+                    if row['content']:
+                        memories[row['box_id']].append({
+                            'type': row['memory_type'],
+                            'id': row['memory_id'],
+                            'position': row['position'],
+                            'content': row['content']
                         })
 
-                return memories
-
-    def _fetch_memory_content(
-        self,
-        cursor,
-        memory_type: str,
-        memory_id: UUID
-    ) -> Optional[str]:
-        """Fetch content for a memory based on its type."""
-        # Map memory types to (table, id_column, content_expression)
-        tables = {
-            'debugging_fact': ('debugging_facts', 'fact_id', "symptom || ': ' || solution"),
-            'claude_memory': ('claude_memories', 'id', 'content'),
-            'crystallization': ('crystallization_events', 'id', 'COALESCE(understanding_as_crystallized, resolving_content)'),
-            'narrative': ('session_narratives', 'id', 'narrative_text'),
-        }
-
-        if memory_type not in tables:
-            return None
-
-        table, id_col, content_col = tables[memory_type]
-        cursor.execute(f"""
-            SELECT {content_col} as content FROM {table} WHERE {id_col} = %s
-        """, (memory_id,))
-        row = cursor.fetchone()
-        return row['content'] if row else None
+        return memories
 
     def search_boxes(
         self,
         query: str,
         limit: int = 10,
-        min_pheromone: float = 5.0
+        min_pheromone: float = 5.0,
+        pheromone_weighted: bool = False
     ) -> List[MemoryBox]:
-        """Search for memory boxes by topic or keywords."""
+        """
+        Search for memory boxes by topic, keywords, events or summary.
+
+        Matches the stored search_vector (GIN-indexed, kept by trigger)
+        or an exact keyword (keywords @> ARRAY[query], also GIN-indexed).
+        Results are ordered by text rank, then pheromone score; with
+        pheromone_weighted=True by text rank times pheromone score.
+        """
+        order = 'rank * pheromone_score DESC' if pheromone_weighted else 'rank DESC'
         with get_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                # Full-text search on topic
-                cur.execute("""
-                    SELECT *,
-                           ts_rank(to_tsvector('english', topic),
-                                   plainto_tsquery('english', %s)) as rank
-                    FROM memory_boxes
+                cur.execute(f"""
+                    SELECT id, topic, keywords, events, summary, memory_count,
+                           pheromone_score, start_time, end_time, is_active,
+                           COALESCE(ts_rank(search_vector, q), 0) as rank
+                    FROM memory_boxes, plainto_tsquery('english', %s) AS q
                     WHERE is_active = TRUE
                       AND pheromone_score >= %s
                       AND (
-                          to_tsvector('english', topic) @@ plainto_tsquery('english', %s)
-                          OR %s = ANY(keywords)
+                          search_vector @@ q
+                          OR keywords @> ARRAY[%s]::text[]
                       )
-                    ORDER BY rank DESC, pheromone_score DESC
+                    ORDER BY {order}, pheromone_score DESC
                     LIMIT %s
-                """, (query, min_pheromone, query, query.lower(), limit))
+                """, (query, min_pheromone, query.lower(), limit))
 
                 return [
                     MemoryBox(
@@ -779,70 +2069,170 @@ class MemboxBuilder:
                 return results
 
 
+# =============================================================================
+# RECALL - Semantic kNN over Memories and Boxes
+# =============================================================================
+
+def recall(
+    query: str,
+    k: int = 10,
+    memory_types: Optional[Iterable[str]] = None,
+    include_boxes: bool = True,
+    conn=None
+) -> List[Dict]:
+    """
+    Find the k memories (and memory boxes) closest in meaning to query.
+
+    The query is embedded once; one statement then runs HNSW cosine kNN
+    over the embeddings table and over box centroids, oversampling by
+    RECALL_OVERSAMPLE, hydrates memory contents with a join per type,
+    and re-ranks by similarity weighted with pheromone score
+    (LN(1 + pheromone) / LN(11), so the default score of 10 weighs 1).
+
+    Returns dicts best first: type ('box' for boxes), id, content,
+    similarity, pheromone_score, score. Empty when no embedding model
+    is available.
+    """
+    model = get_embedding_model() if EMBEDDINGS_AVAILABLE else None
+    if model is None:
+        logger.warning("sentence-transformers not installed; recall unavailable")
+        return []
+
+    # Not through the embedding cache: queries are one-offs
+    vector = np.asarray(model.encode([query[:EMBEDDING_INPUT_CHARS]])[0], dtype=np.float32)
+    candidates = k * RECALL_OVERSAMPLE
+    joins, content, score = memory_join_sql('h')
+    params = {
+        'query': _vector_literal(vector),
+        'model': EMBEDDING_MODEL_NAME,
+        'types': list(memory_types or MEMORY_TYPES),
+        'candidates': candidates,
+        'box_candidates': candidates if include_boxes else 0,
+        'ef_search': max(40, candidates),
+        'k': k,
+    }
+
+    with _use_connection(conn) as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cur:
+            # ef_search bounds how many neighbours HNSW returns before filtering
+            cur.execute(f"""
+                SET LOCAL hnsw.ef_search = %(ef_search)s;
+                WITH memory_hits AS (
+                    SELECT e.memory_type, e.memory_id,
+                           1 - (e.embedding <=> %(query)s::vector) AS similarity
+                    FROM embeddings e
+                    WHERE e.model = %(model)s
+                      AND e.memory_type = ANY(%(types)s)
+                    ORDER BY e.embedding <=> %(query)s::vector
+                    LIMIT %(candidates)s
+                ), box_hits AS (
+                    SELECT mb.id, mb.topic, mb.summary, mb.pheromone_score,
+                           1 - (mb.centroid <=> %(query)s::vector) AS similarity
+                    FROM memory_boxes mb
+                    WHERE mb.is_active = TRUE AND mb.centroid IS NOT NULL
+                    ORDER BY mb.centroid <=> %(query)s::vector
+                    LIMIT %(box_candidates)s
+                ), hits AS (
+                    SELECT h.memory_type AS type, h.memory_id AS id,
+                           {content} AS content, h.similarity,
+                           COALESCE({score}, 10.0) AS pheromone_score
+                    FROM memory_hits h
+                    {joins}
+                    UNION ALL
+                    SELECT 'box', b.id, b.topic || COALESCE(': ' || b.summary, ''),
+                           b.similarity, COALESCE(b.pheromone_score, 10.0)
+                    FROM box_hits b
+                )
+                SELECT type, id, content, similarity, pheromone_score,
+                       similarity * LN(1 + GREATEST(pheromone_score, 0)) / LN(11) AS score
+                FROM hits
+                WHERE content IS NOT NULL
+                ORDER BY score DESC
+                LIMIT %(k)s
+            """, params)
+            return [dict(row) for row in cur.fetchall()]
+
+
 # =============================================================================
 # BATCH PROCESSING - Process existing memories into boxes
 # =============================================================================
 
+def link_recent_boxes(since: datetime, weaver: Optional[TraceWeaver] = None) -> Dict[str, int]:
+    """
+    Run the trace-linking stage on its own for boxes updated since a time.
+
+    Used by the worker's link stage after box-only runs.
+    """
+    weaver = weaver or TraceWeaver()
+    with get_connection_with_commit() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT id FROM memory_boxes
+                WHERE is_active = TRUE AND updated_at >= %s
+                ORDER BY updated_at
+            """, (since,))
+            box_ids = [row[0] for row in cur.fetchall()]
+
+        weaver.load_index(conn)
+        return weaver.link_boxes(box_ids, conn=conn)
+
+
+def iter_existing_memories(
+    memory_types: List[str] = None,
+    limit: int = 1000,
+    min_pheromone: float = 10.0,
+    itersize: int = SCAN_ITERSIZE
+) -> Iterator[MemoryRecord]:
+    """
+    Stream the most recent existing memories, oldest first, as
+    MemoryRecord tuples.
+
+    All types come from one UNION ALL query (see memory_stream_sql) with
+    limit applied across types, so the loom sees them in real time order.
+    Types with a score column are filtered by min_pheromone.
+    """
+    def where(spec: MemoryTypeSpec) -> str:
+        if spec.score_column:
+            return f"src.{spec.score_column} >= %(min_pheromone)s"
+        return 'TRUE'
+
+    query = memory_stream_sql(memory_types or DEFAULT_MEMORY_TYPES, where=where, newest=True)
+    yield from stream_memories(
+        query, {'limit': limit, 'min_pheromone': min_pheromone}, 'membox_bootstrap', itersize
+    )
+
+
 def process_existing_memories(
     memory_types: List[str] = None,
     limit: int = 1000,
-    min_pheromone: float = 10.0
+    min_pheromone: float = 10.0,
+    batch_size: int = EMBEDDING_BATCH_SIZE,
+    itersize: int = SCAN_ITERSIZE,
+    workers: int = 1
 ) -> Dict[str, int]:
     """
     Process existing memories into topic-continuous boxes.
 
     This bootstraps the membox system with existing mempheromone data.
+    limit caps all types together, not each type. Rows are streamed into the builder batch by batch, so peak memory is
+    bounded by the batch size rather than the backlog. With workers > 1,
+    signature extraction for each batch is spread over that many processes.
     """
-    memory_types = memory_types or ['debugging_fact', 'claude_memory', 'crystallization']
-    builder = MemboxBuilder()
+    memory_types = memory_types or DEFAULT_MEMORY_TYPES
+    builder = MemboxBuilder(link_mode='deferred', workers=workers)
     stats = {t: 0 for t in memory_types}
 
-    with get_connection() as conn:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            for memory_type in memory_types:
-                # Determine table and content column
-                if memory_type == 'debugging_fact':
-                    query = """
-                        SELECT fact_id as id, symptom || ': ' || solution as content, first_seen as created_at
-                        FROM debugging_facts
-                        WHERE pheromone_score >= %s
-                        ORDER BY first_seen DESC
-                        LIMIT %s
-                    """
-                    cur.execute(query, (min_pheromone, limit))
-                elif memory_type == 'claude_memory':
-                    query = """
-                        SELECT id, content, created_at
-                        FROM claude_memories
-                        ORDER BY created_at DESC
-                        LIMIT %s
-                    """
-                    cur.execute(query, (limit,))
-                elif memory_type == 'crystallization':
-                    query = """
-                        SELECT id,
-                               COALESCE(understanding_as_crystallized, resolving_content) as content,
-                               created_at
-                        FROM crystallization_events
-                        ORDER BY created_at DESC
-                        LIMIT %s
-                    """
-                    cur.execute(query, (limit,))
-                else:
-                    continue
-
-                for row in cur.fetchall():
-                    try:
-                        builder.add_memory(
-                            memory_type=memory_type,
-                            memory_id=row['id'],
-                            content=row['content'],
-                            timestamp=row.get('created_at')
-                        )
-                        stats[memory_type] += 1
-                    except Exception as e:
-                        logger.warning(f"Failed to process {memory_type} {row['id']}: {e}")
-
+    try:
+        memories = iter_existing_memories(memory_types, limit, min_pheromone, itersize)
+        for batch in iter_batches(memories, batch_size):
+            boxes = builder.add_memories(batch)
+            for record, box in zip(batch, boxes):
+                if box is not None:
+                    stats[record.memory_type] += 1
+
+        builder.link_touched_boxes()
+    finally:
+        builder.loom.close()
     return stats
 
 
@@ -853,13 +2243,31 @@ def process_existing_memories(
 if __name__ == '__main__':
     import sys
 
-    if len(sys.argv) > 1 and sys.argv[1] == 'bootstrap':
-        # Bootstrap with existing memories
-        print("Bootstrapping membox with existing memories...")
+    if len(sys.argv) > 2 and sys.argv[1] == 'recall':
+        # Semantic search: recall "query" [k]
+        k = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+        for hit in recall(sys.argv[2], k):
+            print(f"{hit['score']:.3f}  [{hit['type']}] {hit['content'][:100]}")
+    elif len(sys.argv) > 1 and sys.argv[1] == 'embed':
+        # Backfill the embeddings table: embed [memory_type ...] (default: all types)
+        memory_types = sys.argv[2:] or list(MEMORY_TYPES)
+        print(f"Embedding memories without a {EMBEDDING_MODEL_NAME} embedding: {', '.join(memory_types)}")
+        stats = embed_memories(memory_types)
+        print(f"Embedded: {stats['embedded']} of {stats['found']} "
+              f"({stats['encode_seconds']:.1f}s encoding, {stats['batches']} batches)")
+    elif len(sys.argv) > 1 and sys.argv[1] == 'bootstrap':
+        # Bootstrap with existing memories: bootstrap [workers] (default: 1;
+        # more processes pay off on large backlogs)
+        workers = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+        memory_types = ['debugging_fact', 'crystallization']
+        print(f"Bootstrapping membox with existing memories ({workers} workers)...")
         stats = process_existing_memories(
-            memory_types=['debugging_fact', 'crystallization'],
-            limit=500,
-            min_pheromone=12.0
+            memory_types=memory_types,
+            # limit caps the merged stream; keep up to 500 of each type
+            limit=500 * len(memory_types),
+            min_pheromone=12.0,
+            batch_size=EMBEDDING_BATCH_SIZE * workers,
+            workers=workers
         )
         print(f"Processed: {stats}")
     else:
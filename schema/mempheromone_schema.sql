@@ -75,6 +75,7 @@ CREATE TABLE IF NOT EXISTS embeddings (
     memory_type VARCHAR(50) NOT NULL,
     memory_id UUID NOT NULL,
     embedding vector(384),  -- sentence-transformers default dimension
+    model VARCHAR(100),     -- embedding model; rows from other models are re-embedded
     created_at TIMESTAMP DEFAULT NOW(),
     UNIQUE(memory_type, memory_id)
 );
@@ -91,8 +92,15 @@ CREATE TABLE IF NOT EXISTS memory_boxes (
     pheromone_score FLOAT DEFAULT 10.0,
     is_active BOOLEAN DEFAULT TRUE,
     keywords TEXT[],
+    events TEXT[],
+    summary TEXT,
     first_memory_at TIMESTAMP,
     last_memory_at TIMESTAMP,
+    start_time TIMESTAMP,
+    end_time TIMESTAMP,
+    centroid vector(384),  -- running mean of member embeddings (Topic Loom warm start)
+    centroid_count INTEGER DEFAULT 0,
+    search_vector tsvector,  -- topic/keywords/events/summary, kept by trigger (search_boxes)
     created_at TIMESTAMP DEFAULT NOW(),
     updated_at TIMESTAMP DEFAULT NOW()
 );
@@ -113,12 +121,47 @@ CREATE TABLE IF NOT EXISTS trace_links (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     source_box_id UUID REFERENCES memory_boxes(id) ON DELETE CASCADE,
     target_box_id UUID REFERENCES memory_boxes(id) ON DELETE CASCADE,
+    link_type VARCHAR(50),
     similarity_score FLOAT,
     linking_events TEXT[],
     created_at TIMESTAMP DEFAULT NOW(),
     UNIQUE(source_box_id, target_box_id)
 );
 
+-- Membox Checkpoints: per-type created_at high-water mark for
+-- incremental ingestion (membox_worker.py --incremental)
+CREATE TABLE IF NOT EXISTS membox_checkpoints (
+    memory_type VARCHAR(50) PRIMARY KEY,
+    last_created_at TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+
+-- Membox Claims: leases that keep concurrent workers off the same memories.
+-- A claim is marked done in the transaction that boxes the memory; an
+-- expired claim that is not done is retried until it has been attempted
+-- CLAIM_MAX_ATTEMPTS times (delete the row to try again).
+CREATE TABLE IF NOT EXISTS membox_claims (
+    memory_type VARCHAR(50) NOT NULL,
+    memory_id UUID NOT NULL,
+    worker_id TEXT NOT NULL,
+    claimed_at TIMESTAMP DEFAULT NOW(),
+    leased_until TIMESTAMP NOT NULL,
+    done BOOLEAN DEFAULT FALSE,
+    attempts INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (memory_type, memory_id)
+);
+
+-- Upgrades for databases created before these columns existed
+ALTER TABLE memory_boxes ADD COLUMN IF NOT EXISTS centroid vector(384);
+ALTER TABLE memory_boxes ADD COLUMN IF NOT EXISTS centroid_count INTEGER DEFAULT 0;
+ALTER TABLE memory_boxes ADD COLUMN IF NOT EXISTS events TEXT[];
+ALTER TABLE memory_boxes ADD COLUMN IF NOT EXISTS summary TEXT;
+ALTER TABLE memory_boxes ADD COLUMN IF NOT EXISTS start_time TIMESTAMP;
+ALTER TABLE memory_boxes ADD COLUMN IF NOT EXISTS end_time TIMESTAMP;
+ALTER TABLE memory_boxes ADD COLUMN IF NOT EXISTS search_vector tsvector;
+ALTER TABLE trace_links ADD COLUMN IF NOT EXISTS link_type VARCHAR(50);
+ALTER TABLE embeddings ADD COLUMN IF NOT EXISTS model VARCHAR(100);
+
 -- =============================================================================
 -- Chat History (for multi-agent systems)
 -- =============================================================================
@@ -141,12 +184,16 @@ CREATE INDEX IF NOT EXISTS idx_debugging_facts_accessed
     ON debugging_facts(last_accessed DESC);
 CREATE INDEX IF NOT EXISTS idx_debugging_facts_created
     ON debugging_facts(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_debugging_facts_keyset
+    ON debugging_facts(first_seen, fact_id);
 
 -- Claude memories indexes
 CREATE INDEX IF NOT EXISTS idx_claude_memories_pheromone
     ON claude_memories(pheromone_score DESC);
 CREATE INDEX IF NOT EXISTS idx_claude_memories_created
     ON claude_memories(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_claude_memories_keyset
+    ON claude_memories(created_at, id);
 
 -- Memory boxes indexes
 CREATE INDEX IF NOT EXISTS idx_memory_boxes_pheromone
@@ -155,6 +202,12 @@ CREATE INDEX IF NOT EXISTS idx_memory_boxes_active
     ON memory_boxes(is_active) WHERE is_active = TRUE;
 CREATE INDEX IF NOT EXISTS idx_memory_boxes_updated
     ON memory_boxes(updated_at DESC);
+CREATE INDEX IF NOT EXISTS idx_memory_boxes_centroid_hnsw
+    ON memory_boxes USING hnsw (centroid vector_cosine_ops);
+CREATE INDEX IF NOT EXISTS idx_memory_boxes_search
+    ON memory_boxes USING gin (search_vector);
+CREATE INDEX IF NOT EXISTS idx_memory_boxes_keywords
+    ON memory_boxes USING gin (keywords);
 
 -- Memory box items indexes
 CREATE INDEX IF NOT EXISTS idx_memory_box_items_box
@@ -162,6 +215,10 @@ CREATE INDEX IF NOT EXISTS idx_memory_box_items_box
 CREATE INDEX IF NOT EXISTS idx_memory_box_items_memory
     ON memory_box_items(memory_type, memory_id);
 
+-- Membox claims indexes (retry queue)
+CREATE INDEX IF NOT EXISTS idx_membox_claims_expired
+    ON membox_claims(leased_until) WHERE NOT done;
+
 -- Trace links indexes
 CREATE INDEX IF NOT EXISTS idx_trace_links_source
     ON trace_links(source_box_id);
@@ -185,6 +242,8 @@ CREATE INDEX IF NOT EXISTS idx_session_narratives_session
 -- Crystallizations indexes
 CREATE INDEX IF NOT EXISTS idx_crystallization_events_created
     ON crystallization_events(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_crystallization_events_keyset
+    ON crystallization_events(created_at, id);
 CREATE INDEX IF NOT EXISTS idx_crystallization_events_temperature
     ON crystallization_events(temperature DESC);
 
@@ -236,6 +295,135 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql;
 
+-- =============================================================================
+-- Membox Worker Notifications
+-- =============================================================================
+
+-- Wake the membox worker daemon (membox_worker.py --daemon) on new memories.
+-- TG_ARGV: memory type, id column of the source table.
+CREATE OR REPLACE FUNCTION notify_membox_new_memory()
+RETURNS TRIGGER AS $$
+BEGIN
+    PERFORM pg_notify(
+        'membox_new_memory',
+        json_build_object(
+            'memory_type', TG_ARGV[0],
+            'memory_id', to_jsonb(NEW) ->> TG_ARGV[1]
+        )::text
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS membox_notify_debugging_facts ON debugging_facts;
+CREATE TRIGGER membox_notify_debugging_facts
+    AFTER INSERT ON debugging_facts
+    FOR EACH ROW EXECUTE FUNCTION notify_membox_new_memory('debugging_fact', 'fact_id');
+
+DROP TRIGGER IF EXISTS membox_notify_claude_memories ON claude_memories;
+CREATE TRIGGER membox_notify_claude_memories
+    AFTER INSERT ON claude_memories
+    FOR EACH ROW EXECUTE FUNCTION notify_membox_new_memory('claude_memory', 'id');
+
+DROP TRIGGER IF EXISTS membox_notify_crystallization_events ON crystallization_events;
+CREATE TRIGGER membox_notify_crystallization_events
+    AFTER INSERT ON crystallization_events
+    FOR EACH ROW EXECUTE FUNCTION notify_membox_new_memory('crystallization', 'id');
+
+-- =============================================================================
+-- Memory Box Search
+-- =============================================================================
+
+-- Keep memory_boxes.search_vector in step with the searchable columns, so
+-- search_boxes() can use the GIN index instead of parsing every topic.
+-- Weights: topic A, keywords B, events C, summary D.
+CREATE OR REPLACE FUNCTION memory_boxes_search_vector()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('english', COALESCE(NEW.topic, '')), 'A') ||
+        setweight(to_tsvector('english', COALESCE(array_to_string(NEW.keywords, ' '), '')), 'B') ||
+        setweight(to_tsvector('english', COALESCE(array_to_string(NEW.events, ' '), '')), 'C') ||
+        setweight(to_tsvector('english', COALESCE(NEW.summary, '')), 'D');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS memory_boxes_search_vector ON memory_boxes;
+CREATE TRIGGER memory_boxes_search_vector
+    BEFORE INSERT OR UPDATE OF topic, keywords, events, summary ON memory_boxes
+    FOR EACH ROW EXECUTE FUNCTION memory_boxes_search_vector();
+
+-- Backfill boxes created before the trigger existed
+UPDATE memory_boxes SET topic = topic WHERE search_vector IS NULL;
+
+-- =============================================================================
+-- Table Change Counters
+-- =============================================================================
+
+-- Per-table count of data-changing statements, for cheap change detection
+-- (mempheromone_export.py's section cache). Transactional, so a reader sees
+-- exactly the changes its snapshot sees. Writers bump one of 8 shard rows
+-- picked by backend pid, so concurrent writers rarely wait on each other;
+-- readers sum the shards.
+CREATE TABLE IF NOT EXISTS table_changes (
+    table_name TEXT NOT NULL,
+    shard SMALLINT NOT NULL,
+    changes BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (table_name, shard)
+);
+
+CREATE OR REPLACE FUNCTION count_table_change()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO table_changes (table_name, shard, changes)
+    VALUES (TG_TABLE_NAME, pg_backend_pid() % 8, 1)
+    ON CONFLICT (table_name, shard) DO UPDATE
+        SET changes = table_changes.changes + 1;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS table_changes_debugging_facts ON debugging_facts;
+CREATE TRIGGER table_changes_debugging_facts
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON debugging_facts
+    FOR EACH STATEMENT EXECUTE FUNCTION count_table_change();
+
+DROP TRIGGER IF EXISTS table_changes_claude_memories ON claude_memories;
+CREATE TRIGGER table_changes_claude_memories
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON claude_memories
+    FOR EACH STATEMENT EXECUTE FUNCTION count_table_change();
+
+DROP TRIGGER IF EXISTS table_changes_session_narratives ON session_narratives;
+CREATE TRIGGER table_changes_session_narratives
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON session_narratives
+    FOR EACH STATEMENT EXECUTE FUNCTION count_table_change();
+
+DROP TRIGGER IF EXISTS table_changes_crystallization_events ON crystallization_events;
+CREATE TRIGGER table_changes_crystallization_events
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON crystallization_events
+    FOR EACH STATEMENT EXECUTE FUNCTION count_table_change();
+
+DROP TRIGGER IF EXISTS table_changes_wisdom ON wisdom;
+CREATE TRIGGER table_changes_wisdom
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON wisdom
+    FOR EACH STATEMENT EXECUTE FUNCTION count_table_change();
+
+DROP TRIGGER IF EXISTS table_changes_embeddings ON embeddings;
+CREATE TRIGGER table_changes_embeddings
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON embeddings
+    FOR EACH STATEMENT EXECUTE FUNCTION count_table_change();
+
+DROP TRIGGER IF EXISTS table_changes_memory_boxes ON memory_boxes;
+CREATE TRIGGER table_changes_memory_boxes
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON memory_boxes
+    FOR EACH STATEMENT EXECUTE FUNCTION count_table_change();
+
+DROP TRIGGER IF EXISTS table_changes_trace_links ON trace_links;
+CREATE TRIGGER table_changes_trace_links
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON trace_links
+    FOR EACH STATEMENT EXECUTE FUNCTION count_table_change();
+
 -- =============================================================================
 -- Views for Common Queries
 -- =============================================================================
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Signature Extractor Benchmark
+
+Compares the single-pass SignatureExtractor against the previous
+extraction (one findall for words plus one findall per event verb
+family) on long, crystallization-sized texts.
+
+Both must produce the same signatures, except that event verbs now have
+to start a word (the old patterns also matched 'fix' inside 'prefix'),
+so the comparison runs the old patterns with a leading \\b. The script
+exits non-zero if they differ.
+
+Usage:
+    # Defaults: 200 texts of ~6000 characters, best of 5 rounds
+    python3 bench_signature_extractor.py
+
+    # Longer texts, more rounds
+    python3 bench_signature_extractor.py --texts 100 --chars 20000 --repeat 10
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent / 'rlm-plugin/scripts'))
+
+from mempheromone_membox import (
+    MAX_EVENTS_PER_MEMORY,
+    TECH_KEYWORDS,
+    SignatureExtractor
+)
+
+# The extraction SignatureExtractor replaced, kept here as the baseline
+LEGACY_EVENT_PATTERNS = [
+    r'(?:fixed|fix|resolved|resolve)\s+([^.!?\n]+)',
+    r'(?:implemented|implement|added|add)\s+([^.!?\n]+)',
+    r'(?:created|create|built|build)\s+([^.!?\n]+)',
+    r'(?:updated|update|changed|change)\s+([^.!?\n]+)',
+    r'(?:deleted|delete|removed|remove)\s+([^.!?\n]+)',
+    r'(?:discovered|discover|found|find)\s+([^.!?\n]+)',
+    r'(?:configured|configure|setup|set up)\s+([^.!?\n]+)',
+    r'(?:debugged|debug|diagnosed|diagnose)\s+([^.!?\n]+)',
+]
+
+
+# Same patterns with the word-start anchor SignatureExtractor applies
+ANCHORED_EVENT_PATTERNS = [r'\b' + pattern for pattern in LEGACY_EVENT_PATTERNS]
+
+
+def legacy_extract(content: str, patterns=LEGACY_EVENT_PATTERNS):
+    words = set(re.findall(r'\b[a-z]+\b', content.lower()))
+    keywords = sorted(words & TECH_KEYWORDS)[:10]
+
+    events = []
+    for pattern in patterns:
+        matches = re.findall(pattern, content, re.IGNORECASE)
+        for match in matches[:2]:
+            event = match.strip()[:80]
+            if event and len(event) > 5:
+                events.append(event)
+
+    lines = content.strip().split('\n')
+    topic = lines[0][:100] if lines else 'Unknown'
+    return topic, keywords, events[:MAX_EVENTS_PER_MEMORY]
+
+
+FILLER = (
+    'the', 'a', 'connection', 'pool', 'timeout', 'when', 'under', 'load',
+    'we', 'realized', 'that', 'retry', 'logic', 'was', 'masking', 'it',
+    'understanding', 'shifted', 'toward', 'treating', 'state', 'as', 'data',
+    'suffix', 'address', 'findings', 'prefix', 'updates', 'rebuilt',
+)
+VERBS = (
+    'Fixed', 'fix', 'resolved', 'implemented', 'added', 'created', 'built',
+    'updated', 'changed', 'deleted', 'removed', 'discovered', 'found',
+    'configured', 'set up', 'debugged', 'diagnosed',
+)
+PUNCTUATION = ('.', '.', '!', '?', '\n', ',', ';')
+
+
+def make_text(rng: random.Random, chars: int) -> str:
+    """Crystallization-like prose: long, mixed case, verbs and tech terms."""
+    keywords = sorted(TECH_KEYWORDS)
+    parts = []
+    size = 0
+    while size < chars:
+        roll = rng.random()
+        if roll < 0.08:
+            word = rng.choice(VERBS)
+        elif roll < 0.18:
+            word = rng.choice(keywords)
+            word = word.upper() if rng.random() < 0.1 else word
+        else:
+            word = rng.choice(FILLER)
+        parts.append(word)
+        if rng.random() < 0.07:
+            parts.append(rng.choice(PUNCTUATION))
+        size += len(word) + 1
+    return ' '.join(parts)
+
+
+def best_of(func, texts, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Signature Extractor Benchmark')
+    parser.add_argument('--texts', type=int, default=200,
+                       help='Number of texts (default: 200)')
+    parser.add_argument('--chars', type=int, default=6000,
+                       help='Approximate characters per text (default: 6000)')
+    parser.add_argument('--repeat', type=int, default=5,
+                       help='Timing rounds; the best is reported (default: 5)')
+    parser.add_argument('--seed', type=int, default=42,
+                       help='Random seed for the generated texts (default: 42)')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    texts = [make_text(rng, args.chars) for _ in range(args.texts)]
+    extractor = SignatureExtractor()
+
+    mismatches = [
+        i for i, text in enumerate(texts)
+        if extractor.extract(text) != legacy_extract(text, ANCHORED_EVENT_PATTERNS)
+    ]
+    if mismatches:
+        print(f"Output differs from the legacy extractor on {len(mismatches)} texts "
+              f"(first: #{mismatches[0]})")
+        return 1
+
+    megabytes = sum(len(text) for text in texts) / 1e6
+    legacy = best_of(legacy_extract, texts, args.repeat)
+    single = best_of(extractor.extract, texts, args.repeat)
+
+    print(f"{args.texts} texts x ~{args.chars} chars, best of {args.repeat}")
+    print(f"Legacy (9 scans):   {legacy * 1e3:8.1f} ms  {megabytes / legacy:6.1f} MB/s")
+    print(f"Single pass:        {single * 1e3:8.1f} ms  {megabytes / single:6.1f} MB/s")
+    print(f"Speedup:            {legacy / single:8.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
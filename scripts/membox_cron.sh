@@ -36,7 +36,7 @@ fi
     echo "Membox Cron Job - $(date)"
     echo "========================================="
 
-    python3 "${WORKER_SCRIPT}" --since 1h
+    python3 "${WORKER_SCRIPT}" --incremental --since 1h
 
     EXIT_CODE=$?
 
@@ -15,24 +15,58 @@ Usage:
     # Process specific count
     python3 membox_worker.py --limit 100
 
+    # Larger embedding batches (default: 64)
+    python3 membox_worker.py --since 24h --batch-size 256
+
     # Dry run
     python3 membox_worker.py --since 1h --dry-run
+
+    # Only memories past the stored checkpoint (--since bounds the first run)
+    python3 membox_worker.py --incremental
+
+    # Long-running: wake on NOTIFY from the insert triggers, keep the model warm
+    python3 membox_worker.py --daemon --max-latency 5
+
+    # Box only, then link the touched boxes in a separate stage
+    python3 membox_worker.py --since 1h --stage box
+    python3 membox_worker.py --since 1h --stage link
+
+    # Only load embeddings for memories that lack one from the current model
+    python3 membox_worker.py --since 7d --stage embed
 """
 
 import argparse
+import itertools
 import logging
 import os
+import select
+import signal
+import socket
 import sys
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 
+from psycopg2.extras import execute_values
+
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / '.claude/plugins/rlm-prototype/scripts'))
 
 from mempheromone_membox import (
     MemboxBuilder,
+    DEFAULT_MEMORY_TYPES,
+    EMBEDDINGS_AVAILABLE,
+    MEMORY_TYPES,
+    MemoryTypeSpec,
+    SCAN_ITERSIZE,
+    embed_memories,
     get_connection,
-    RealDictCursor
+    get_connection_with_commit,
+    get_embedding_cache,
+    iter_batches,
+    link_recent_boxes,
+    memory_stream_sql,
+    stream_memories
 )
 
 logging.basicConfig(
@@ -41,6 +75,40 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Channel the insert triggers notify (see notify_membox_new_memory in the schema)
+NOTIFY_CHANNEL = 'membox_new_memory'
+
+# How long a claim keeps other workers off a memory; an expired claim that
+# was never completed is retried by the next incremental run
+CLAIM_LEASE = timedelta(minutes=10)
+
+# A memory whose claim has been taken this many times without being
+# completed (content that cannot be boxed, a write that always fails) is
+# given up on; delete its membox_claims row to retry it
+CLAIM_MAX_ATTEMPTS = 3
+
+# Completed claims are kept this long so workers scanning an older snapshot
+# still see that the memory was taken
+CLAIM_RETENTION = timedelta(days=1)
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# created_at is stamped when the inserting transaction starts, not when it
+# commits, so a row can turn up behind a checkpoint saved in the meantime;
+# incremental runs rescan this far behind each checkpoint to catch it
+CHECKPOINT_OVERLAP = timedelta(minutes=5)
+
+
+def load_keywords(path: str) -> list:
+    """Read one keyword per line, skipping blank lines and # comments."""
+    keywords = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                keywords.append(line.lower())
+    return keywords
+
 
 def parse_time_span(time_str: str) -> timedelta:
     """Parse time span like '1h', '24h', '7d' to timedelta."""
@@ -60,160 +128,456 @@ def parse_time_span(time_str: str) -> timedelta:
         raise ValueError(f"Unknown time unit: {unit} (use h/d/m)")
 
 
-def get_recent_unboxed_memories(since: timedelta, limit: int = 1000, memory_types: list = None):
+def _has_content(spec: MemoryTypeSpec) -> str:
+    """The memory has text to box (NULL and empty content are skipped)."""
+    return f"({spec.content('src')}) <> ''"
+
+
+def _not_given_up(spec: MemoryTypeSpec) -> str:
+    """Anti-join: the memory has not used up its claim attempts."""
+    return f"""NOT EXISTS (
+                SELECT 1 FROM membox_claims c
+                WHERE c.memory_type = '{spec.memory_type}'
+                  AND c.memory_id = src.{spec.id_column}
+                  AND NOT c.done
+                  AND c.attempts >= {CLAIM_MAX_ATTEMPTS}
+            )"""
+
+
+def _not_boxed(spec: MemoryTypeSpec) -> str:
+    """Anti-join: the memory is not in any box yet."""
+    return f"""NOT EXISTS (
+                SELECT 1 FROM memory_box_items mbi
+                WHERE mbi.memory_type = '{spec.memory_type}'
+                  AND mbi.memory_id = src.{spec.id_column}
+            )"""
+
+
+def iter_unboxed_memories(
+    since: timedelta,
+    limit: int = 1000,
+    memory_types: list = None,
+    itersize: int = SCAN_ITERSIZE
+):
     """
-    Get recent memories that haven't been added to membox yet.
+    Stream recent memories that haven't been added to membox yet.
+
+    All types come from one UNION ALL query in chronological order, so
+    the loom sees memories in the order they happened. The stream is read
+    through a server-side cursor, itersize rows per round trip.
 
     Args:
         since: Time window (e.g., timedelta(hours=1))
-        limit: Max memories to process
+        limit: Max memories to process, across all types
         memory_types: List of memory types to process
+        itersize: Rows fetched per round trip
+
+    Yields:
+        MemoryRecord tuples, oldest first
+    """
+    query = memory_stream_sql(
+        memory_types or DEFAULT_MEMORY_TYPES,
+        where=lambda spec: (
+            f"src.{spec.created_column} >= %(cutoff)s AND {_has_content(spec)} "
+            f"AND {_not_boxed(spec)} AND {_not_given_up(spec)}"
+        )
+    )
+    params = {'cutoff': datetime.now() - since, 'limit': limit}
+    yield from stream_memories(query, params, 'membox_unboxed', itersize)
+
+
+def get_recent_unboxed_memories(since: timedelta, limit: int = 1000, memory_types: list = None):
+    """
+    Get recent memories that haven't been added to membox yet.
+
+    Materializes iter_unboxed_memories(); prefer the iterator for large windows.
 
     Returns:
-        List of dicts with memory info
+        List of MemoryRecord tuples
     """
-    memory_types = memory_types or ['debugging_fact', 'claude_memory', 'crystallization']
-    cutoff_time = datetime.now() - since
+    return list(iter_unboxed_memories(since, limit, memory_types))
 
-    memories = []
 
+def load_checkpoints(memory_types: list) -> dict:
+    """
+    Load the created_at high-water mark of each memory type.
+
+    Returns:
+        Dict mapping memory_type to last_created_at; types that have never
+        been processed incrementally are absent.
+    """
     with get_connection() as conn:
-        with conn.cursor(cursor_factory=RealDictCursor) as cur:
-            for memory_type in memory_types:
-                # Query depends on memory type
-                if memory_type == 'debugging_fact':
-                    query = """
-                        SELECT
-                            df.fact_id as id,
-                            df.symptom || ': ' || df.solution as content,
-                            df.first_seen as created_at,
-                            'debugging_fact' as memory_type
-                        FROM debugging_facts df
-                        LEFT JOIN memory_box_items mbi
-                            ON df.fact_id = mbi.memory_id AND mbi.memory_type = 'debugging_fact'
-                        WHERE df.first_seen >= %s
-                          AND mbi.box_id IS NULL
-                        ORDER BY df.first_seen DESC
-                        LIMIT %s
-                    """
-                    cur.execute(query, (cutoff_time, limit))
-
-                elif memory_type == 'claude_memory':
-                    query = """
-                        SELECT
-                            cm.id,
-                            cm.content,
-                            cm.created_at,
-                            'claude_memory' as memory_type
-                        FROM claude_memories cm
-                        LEFT JOIN memory_box_items mbi
-                            ON cm.id = mbi.memory_id AND mbi.memory_type = 'claude_memory'
-                        WHERE cm.created_at >= %s
-                          AND mbi.box_id IS NULL
-                        ORDER BY cm.created_at DESC
-                        LIMIT %s
-                    """
-                    cur.execute(query, (cutoff_time, limit))
-
-                elif memory_type == 'crystallization':
-                    query = """
-                        SELECT
-                            ce.id,
-                            COALESCE(ce.understanding_as_crystallized, ce.resolving_content) as content,
-                            ce.created_at,
-                            'crystallization' as memory_type
-                        FROM crystallization_events ce
-                        LEFT JOIN memory_box_items mbi
-                            ON ce.id = mbi.memory_id AND mbi.memory_type = 'crystallization'
-                        WHERE ce.created_at >= %s
-                          AND mbi.box_id IS NULL
-                        ORDER BY ce.created_at DESC
-                        LIMIT %s
-                    """
-                    cur.execute(query, (cutoff_time, limit))
-
-                else:
-                    logger.warning(f"Unknown memory type: {memory_type}")
-                    continue
-
-                memories.extend(cur.fetchall())
-
-    return memories
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT memory_type, last_created_at
+                FROM membox_checkpoints
+                WHERE memory_type = ANY(%s)
+            """, (list(memory_types),))
+            return dict(cur.fetchall())
+
+
+def save_checkpoints(conn, checkpoints: dict):
+    """
+    Advance checkpoints on conn, inside the caller's transaction.
+
+    A checkpoint only ever moves forward, so a slower concurrent run
+    cannot rewind one written by a faster run.
+    """
+    if not checkpoints:
+        return
+
+    with conn.cursor() as cur:
+        execute_values(cur, """
+            INSERT INTO membox_checkpoints (memory_type, last_created_at)
+            VALUES %s
+            ON CONFLICT (memory_type) DO UPDATE SET
+                last_created_at = EXCLUDED.last_created_at,
+                updated_at = NOW()
+            WHERE membox_checkpoints.last_created_at < EXCLUDED.last_created_at
+        """, list(checkpoints.items()))
+
+
+def rescan_bounds(checkpoints: dict, since: timedelta, memory_types: list) -> dict:
+    """
+    created_at each type is read from by an incremental run:
+    CHECKPOINT_OVERLAP behind its checkpoint, or now - since if it has none.
+    """
+    cutoff_time = datetime.now() - since
+    return {
+        memory_type: (
+            checkpoints[memory_type] - CHECKPOINT_OVERLAP
+            if memory_type in checkpoints else cutoff_time
+        )
+        for memory_type in memory_types
+    }
+
+
+def iter_new_memories(
+    checkpoints: dict,
+    since: timedelta,
+    limit: int = 1000,
+    memory_types: list = None,
+    itersize: int = SCAN_ITERSIZE,
+    bounds: dict = None
+):
+    """
+    Stream memories created after each type's checkpoint, oldest first.
+
+    Reads are range scans on created_at, so a run costs only the rows
+    past the high-water mark however large the tables grow. Each scan
+    starts CHECKPOINT_OVERLAP behind the checkpoint (see rescan_bounds)
+    to pick up rows that committed after a later row was checkpointed;
+    the NOT EXISTS guard skips everything in that window already boxed,
+    as well as memories boxed by a --since run. All types are merged
+    into one chronological stream by a single UNION ALL query.
+
+    Args:
+        checkpoints: Dict from load_checkpoints()
+        since: Window for types that have no checkpoint yet
+        limit: Max memories across types; the rest are picked up next run
+        memory_types: List of memory types to process
+        itersize: Rows fetched per round trip
+        bounds: Precomputed rescan_bounds(), to share with iter_expired_claims
+
+    Yields:
+        MemoryRecord tuples, ascending by (created_at, id)
+    """
+    memory_types = [t for t in (memory_types or DEFAULT_MEMORY_TYPES) if t in MEMORY_TYPES]
+    bounds = bounds or rescan_bounds(checkpoints, since, memory_types)
+
+    params = {'limit': limit}
+    for memory_type in memory_types:
+        start = bounds[memory_type]
+        logger.info(f"{memory_type}: reading from {start}")
+        params[f'{memory_type}_start'] = start
+
+    def where(spec: MemoryTypeSpec) -> str:
+        return (
+            f"src.{spec.created_column} >= %({spec.memory_type}_start)s "
+            f"AND {_has_content(spec)} AND {_not_boxed(spec)} AND {_not_given_up(spec)}"
+        )
+
+    query = memory_stream_sql(memory_types, where=where)
+    yield from stream_memories(query, params, 'membox_new', itersize)
+
+
+def claim_memories(records: list, lease: timedelta = CLAIM_LEASE) -> list:
+    """
+    Claim records for this worker; returns the ones it won, in order.
+
+    A memory can be claimed when it is not boxed yet and nobody holds a
+    live, uncompleted claim on it, and it has been claimed fewer than
+    CLAIM_MAX_ATTEMPTS times. Claims are committed right away so
+    concurrent workers see them before any box is written.
+
+    A memory listed twice is claimed once: ON CONFLICT cannot touch the
+    same row twice in one statement.
+    """
+    unique = {}
+    for record in records:
+        unique.setdefault((record.memory_type, str(record.memory_id)), record)
+    records = list(unique.values())
+    if not records:
+        return []
+
+    with get_connection_with_commit() as conn:
+        with conn.cursor() as cur:
+            claimed = execute_values(cur, f"""
+                INSERT INTO membox_claims (memory_type, memory_id, worker_id, leased_until)
+                SELECT v.memory_type, v.memory_id, v.worker_id, NOW() + v.lease
+                FROM (VALUES %s) AS v(memory_type, memory_id, worker_id, lease)
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM memory_box_items mbi
+                    WHERE mbi.memory_type = v.memory_type
+                      AND mbi.memory_id = v.memory_id
+                )
+                ON CONFLICT (memory_type, memory_id) DO UPDATE SET
+                    worker_id = EXCLUDED.worker_id,
+                    claimed_at = NOW(),
+                    leased_until = EXCLUDED.leased_until,
+                    attempts = membox_claims.attempts + 1
+                WHERE NOT membox_claims.done
+                  AND membox_claims.leased_until < NOW()
+                  AND membox_claims.attempts < {CLAIM_MAX_ATTEMPTS}
+                RETURNING memory_type, memory_id, attempts
+            """, [
+                (record.memory_type, str(record.memory_id), WORKER_ID, lease)
+                for record in records
+            ], template='(%s, %s::uuid, %s, %s::interval)', fetch=True)
+
+    won = set()
+    for memory_type, memory_id, attempts in claimed:
+        won.add((memory_type, str(memory_id)))
+        if attempts >= CLAIM_MAX_ATTEMPTS:
+            logger.warning(
+                f"Last attempt for {memory_type} {memory_id} "
+                f"({attempts - 1} earlier attempts did not complete)"
+            )
+    return [r for r in records if (r.memory_type, str(r.memory_id)) in won]
+
+
+def complete_claims(conn, records: list):
+    """Mark claims done on conn, in the same transaction as the box writes."""
+    if not records:
+        return
+
+    with conn.cursor() as cur:
+        execute_values(cur, """
+            UPDATE membox_claims c
+            SET done = TRUE
+            FROM (VALUES %s) AS v(memory_type, memory_id)
+            WHERE c.memory_type = v.memory_type
+              AND c.memory_id = v.memory_id
+        """, [
+            (record.memory_type, str(record.memory_id)) for record in records
+        ], template='(%s, %s::uuid)')
+
+
+def prune_claims(retention: timedelta = CLAIM_RETENTION) -> int:
+    """Delete completed claims older than retention; returns the count."""
+    with get_connection_with_commit() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                DELETE FROM membox_claims
+                WHERE done AND claimed_at < NOW() - %s
+            """, (retention,))
+            return cur.rowcount
+
+
+def iter_expired_claims(
+    limit: int = 1000,
+    memory_types: list = None,
+    itersize: int = SCAN_ITERSIZE,
+    before: dict = None
+):
+    """
+    Stream memories whose claim expired without being completed.
+
+    These belong to a worker that crashed or whose write failed. They may
+    sit behind the checkpoint already, so incremental runs read this
+    retry queue first.
+
+    Args:
+        before: Per-type created_at bound (rescan_bounds()); memories at or
+            past it are left to iter_new_memories, so no memory is read
+            by both scans
+
+    Yields:
+        MemoryRecord tuples, oldest first
+    """
+    memory_types = memory_types or DEFAULT_MEMORY_TYPES
+    params = {'limit': limit}
+    for memory_type, bound in (before or {}).items():
+        params[f'{memory_type}_before'] = bound
+
+    def where(spec: MemoryTypeSpec) -> str:
+        condition = (
+            f"NOT c.done AND c.leased_until < NOW() "
+            f"AND c.attempts < {CLAIM_MAX_ATTEMPTS} AND {_has_content(spec)}"
+        )
+        if before and spec.memory_type in before:
+            condition += f" AND src.{spec.created_column} < %({spec.memory_type}_before)s"
+        return condition
+
+    def join(spec: MemoryTypeSpec) -> str:
+        return (
+            f"JOIN membox_claims c ON c.memory_type = '{spec.memory_type}' "
+            f"AND c.memory_id = src.{spec.id_column}"
+        )
+
+    query = memory_stream_sql(memory_types, where=where, join=join)
+    yield from stream_memories(query, params, 'membox_retry', itersize)
+
+
+def _batch_checkpoints(batch: list) -> dict:
+    """Latest created_at per memory type in a batch."""
+    checkpoints = {}
+    for record in batch:
+        if record.timestamp is not None:
+            checkpoints[record.memory_type] = max(
+                record.timestamp, checkpoints.get(record.memory_type, record.timestamp)
+            )
+    return checkpoints
+
+
+def _empty_stats() -> dict:
+    return {
+        'found': 0,
+        'processed': 0,
+        'boxes_created': 0,
+        'boxes_updated': 0,
+        'errors': 0,
+        'batches': 0,
+        'encode_seconds': 0.0,
+        'links_inserted': 0,
+        'links_updated': 0,
+        'claimed_elsewhere': 0
+    }
 
 
 def process_memories_into_membox(
     since: timedelta = None,
     limit: int = 1000,
     memory_types: list = None,
-    dry_run: bool = False
+    dry_run: bool = False,
+    batch_size: int = 64,
+    link: bool = True,
+    itersize: int = SCAN_ITERSIZE,
+    incremental: bool = False,
+    builder: MemboxBuilder = None,
+    workers: int = 1,
+    keywords: list = None
 ):
     """
     Process recent memories into membox.
 
+    Memories are streamed from the database and fed to the builder one
+    batch at a time. Trace links are computed once per touched box at
+    the end of the run.
+
+    Each batch is claimed before it is boxed (see claim_memories), so
+    overlapping runs split the work instead of boxing the same memories
+    twice; memories claimed by another worker are skipped.
+
+    In incremental mode only memories past each type's checkpoint (less
+    CHECKPOINT_OVERLAP) are read, and the checkpoint advances in the same transaction as each
+    batch's box writes. Memories whose claim expired unfinished (crashed
+    worker, failed write) are retried first.
+
     Args:
         since: Time window (default: 1 hour)
-        limit: Max memories per type
+        limit: Max memories, across all types (incremental: retries included)
         memory_types: Types to process
         dry_run: Preview only, don't actually process
+        batch_size: Memories embedded per encode call
+        link: Run the linking pass (False leaves it to the link stage)
+        itersize: Rows fetched per round trip from the database
+        incremental: Read past stored checkpoints instead of the --since window
+        builder: Reuse a warm builder (daemon mode) instead of creating one
+        workers: Processes for signature extraction when creating a builder
+        keywords: Keyword vocabulary when creating a builder (default: TECH_KEYWORDS)
 
     Returns:
         Dict with processing stats
     """
     since = since or timedelta(hours=1)
-    memory_types = memory_types or ['debugging_fact', 'claude_memory', 'crystallization']
+    memory_types = memory_types or DEFAULT_MEMORY_TYPES
 
     logger.info(f"Processing memories from last {since}")
     logger.info(f"Memory types: {memory_types}")
     logger.info(f"Dry run: {dry_run}")
-
-    # Get unboxed memories
-    memories = get_recent_unboxed_memories(since, limit, memory_types)
-
-    if not memories:
-        logger.info("No new memories to process")
-        return {
-            'found': 0,
-            'processed': 0,
-            'boxes_created': 0,
-            'boxes_updated': 0,
-            'errors': 0
-        }
-
-    logger.info(f"Found {len(memories)} unboxed memories")
+    logger.info(f"Incremental: {incremental}")
+
+    # Stream unboxed memories
+    if incremental:
+        checkpoints = load_checkpoints(memory_types)
+        bounds = rescan_bounds(checkpoints, since, memory_types)
+        # Retries first; --limit covers both scans together
+        memories = itertools.islice(itertools.chain(
+            iter_expired_claims(limit, memory_types, itersize, before=bounds),
+            iter_new_memories(checkpoints, since, limit, memory_types, itersize, bounds=bounds)
+        ), limit)
+    else:
+        memories = iter_unboxed_memories(since, limit, memory_types, itersize)
+    stats = _empty_stats()
 
     if dry_run:
         logger.info("DRY RUN - would process:")
-        for mem in memories[:10]:
-            logger.info(f"  [{mem['memory_type']}] {mem['content'][:60]}...")
-        if len(memories) > 10:
-            logger.info(f"  ... and {len(memories) - 10} more")
-        return {
-            'found': len(memories),
-            'processed': 0,
-            'boxes_created': 0,
-            'boxes_updated': 0,
-            'errors': 0
-        }
+        for mem in memories:
+            if stats['found'] < 10:
+                logger.info(f"  [{mem.memory_type}] {(mem.content or '')[:60]}...")
+            stats['found'] += 1
+        if stats['found'] > 10:
+            logger.info(f"  ... and {stats['found'] - 10} more")
+        if not stats['found']:
+            logger.info("No new memories to process")
+        return stats
 
     # Process memories
-    builder = MemboxBuilder()
-
-    stats = {
-        'found': len(memories),
-        'processed': 0,
-        'boxes_created': 0,
-        'boxes_updated': 0,
-        'errors': 0
-    }
-
-    for mem in memories:
-        try:
-            box = builder.add_memory(
-                memory_type=mem['memory_type'],
-                memory_id=mem['id'],
-                content=mem['content'],
-                timestamp=mem['created_at']
-            )
+    owns_builder = builder is None
+    if owns_builder:
+        builder = MemboxBuilder(link_mode='deferred', workers=workers, keywords=keywords)
+    try:
+        return _box_memories(builder, memories, stats, batch_size, incremental, link)
+    finally:
+        if owns_builder:
+            builder.loom.close()
+
+
+def _box_memories(builder, memories, stats: dict, batch_size: int, incremental: bool, link: bool):
+    """Claim, box and checkpoint streamed memories batch by batch; then link."""
+    pruned = prune_claims()
+    if pruned:
+        logger.debug(f"Pruned {pruned} completed claims")
+
+    for scanned in iter_batches(memories, batch_size):
+        stats['found'] += len(scanned)
+        batch = claim_memories(scanned)
+        stats['claimed_elsewhere'] += len(scanned) - len(batch)
+
+        with builder.session() as conn:
+            boxes = builder.add_memories(batch) if batch else []
+            complete_claims(conn, [
+                record for record, box in zip(batch, boxes) if box is not None
+            ])
+            if incremental:
+                # Rows claimed by others are theirs to finish (or to retry)
+                save_checkpoints(conn, _batch_checkpoints(scanned))
+
+        if not batch:
+            continue
+
+        stats['batches'] += 1
+        stats['encode_seconds'] += builder.loom.last_encode_seconds
+        logger.info(
+            f"Batch {stats['batches']}: {len(batch)} memories, "
+            f"encode {builder.loom.last_encode_seconds:.2f}s"
+        )
+
+        for box in boxes:
+            if box is None:
+                stats['errors'] += 1
+                continue
 
             stats['processed'] += 1
 
@@ -224,27 +588,224 @@ def process_memories_into_membox(
             else:
                 stats['boxes_updated'] += 1
 
-            if stats['processed'] % 10 == 0:
-                logger.info(f"Progress: {stats['processed']}/{len(memories)} memories processed")
+        logger.info(f"Progress: {stats['processed']} memories processed")
 
-        except Exception as e:
-            stats['errors'] += 1
-            logger.error(f"Error processing {mem['memory_type']} {mem['id']}: {e}")
+    if not stats['found']:
+        logger.info("No new memories to process")
+        return stats
+
+    if link:
+        link_counts = builder.link_touched_boxes()
+        stats['links_inserted'] = link_counts['inserted']
+        stats['links_updated'] = link_counts['updated']
+
+    cache = get_embedding_cache()
+    if cache is not None:
+        logger.info(f"Embedding cache: {cache.hits} hits, {cache.misses} misses")
 
     return stats
 
 
+def backfill_embeddings(memory_types: list, limit: int, batch_size: int, itersize: int) -> int:
+    """
+    Store embeddings for up to limit memories that still lack one,
+    however old; returns the number stored.
+
+    Unlike --stage embed this is not bounded by --since: the anti-join
+    against embeddings finds whatever earlier runs missed (downtime,
+    backlogs beyond --limit), oldest first. Memories boxed just before
+    were embedded then, so they are mostly embedding cache hits. Without
+    sentence-transformers this does nothing.
+    """
+    if not EMBEDDINGS_AVAILABLE:
+        return 0
+    stats = embed_memories(memory_types, limit=limit, batch_size=batch_size, itersize=itersize)
+    return stats['embedded']
+
+
+def _wait_for_notifications(
+    conn,
+    wakeup_fd: int,
+    timeout: float,
+    max_latency: float,
+    max_pending: int
+) -> int:
+    """
+    Block until memories are announced on conn, then micro-batch them.
+
+    After the first notification, keep collecting for up to max_latency
+    seconds or until max_pending have arrived, so a burst of inserts is
+    boxed in one pass. Returns the number of notifications received
+    (0 if timeout elapsed or a signal arrived on wakeup_fd first).
+    """
+    readable, _, _ = select.select([conn, wakeup_fd], [], [], timeout)
+    if conn not in readable:
+        return 0
+
+    deadline = time.monotonic() + max_latency
+    pending = 0
+    while True:
+        conn.poll()
+        pending += len(conn.notifies)
+        conn.notifies.clear()
+
+        remaining = deadline - time.monotonic()
+        if pending >= max_pending or remaining <= 0:
+            return pending
+
+        readable, _, _ = select.select([conn, wakeup_fd], [], [], remaining)
+        if wakeup_fd in readable:
+            return pending
+
+
+def run_daemon(
+    since: timedelta,
+    limit: int = 1000,
+    memory_types: list = None,
+    batch_size: int = 64,
+    itersize: int = SCAN_ITERSIZE,
+    max_latency: float = 5.0,
+    poll_interval: float = 300.0,
+    workers: int = 1,
+    keywords: list = None
+) -> int:
+    """
+    Box new memories as they arrive, until SIGTERM or SIGINT.
+
+    Insert triggers NOTIFY NOTIFY_CHANNEL; each wake-up runs an incremental
+    pass, which reads every memory past the checkpoints, so the
+    notifications only decide when to run. The builder (embedding model,
+    topic window, event index) stays warm between passes.
+
+    Every poll_interval seconds, announced or not, the pass is a full
+    sweep of the since window instead (the NOT EXISTS guard keeps it to
+    unboxed memories). That covers inserts made while no daemon was
+    listening and rows whose transaction committed so late that they
+    fell behind the checkpoint overlap window.
+
+    Args:
+        since: Sweep window, and the window for memory types that have
+            no checkpoint yet
+        limit: Max memories per pass, across all types
+        memory_types: Types to process
+        batch_size: Memories embedded per encode call
+        itersize: Rows fetched per round trip from the database
+        max_latency: Seconds to keep collecting notifications once woken
+        poll_interval: Seconds between full sweeps of the since window
+        workers: Processes for signature extraction
+        keywords: Keyword vocabulary (default: TECH_KEYWORDS)
+
+    Returns:
+        Process exit code
+    """
+    stopping = []
+
+    def _stop(signum, frame):
+        logger.info(f"Received signal {signum}, finishing current pass")
+        stopping.append(signum)
+
+    # Signals write to this pipe, so a blocked select() returns at once
+    wakeup_read, wakeup_write = os.pipe()
+    os.set_blocking(wakeup_write, False)
+    signal.set_wakeup_fd(wakeup_write)
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    builder = MemboxBuilder(link_mode='deferred', workers=workers, keywords=keywords)
+    if not EMBEDDINGS_AVAILABLE:
+        logger.info("sentence-transformers not installed; passes will not store embeddings")
+    passes = 0
+    errors = 0
+
+    with get_connection() as conn:
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {NOTIFY_CHANNEL}")
+            logger.info(f"Listening on {NOTIFY_CHANNEL} (max latency {max_latency}s)")
+
+            # The first pass catches up on anything inserted before we listened
+            announced = 0
+            next_sweep = time.monotonic() + poll_interval
+            while not stopping:
+                sweep = time.monotonic() >= next_sweep
+                if sweep:
+                    logger.info(f"Sweeping unboxed memories from the last {since}")
+                    next_sweep = time.monotonic() + poll_interval
+                elif announced:
+                    logger.info(f"Woken by {announced} new memories")
+
+                stats = process_memories_into_membox(
+                    since=since,
+                    limit=limit,
+                    memory_types=memory_types,
+                    batch_size=batch_size,
+                    itersize=itersize,
+                    incremental=not sweep,
+                    builder=builder
+                )
+                passes += 1
+                errors += stats['errors']
+                evicted = builder.evict_idle_boxes()
+                embedded = backfill_embeddings(memory_types, limit, batch_size, itersize)
+                logger.info(
+                    f"Pass {passes}: {stats['processed']} processed, "
+                    f"{stats['errors']} errors, {embedded} embedded, "
+                    f"{evicted} idle boxes evicted"
+                )
+
+                if not stopping:
+                    announced = _wait_for_notifications(
+                        conn, wakeup_read, max(0.0, next_sweep - time.monotonic()),
+                        max_latency, batch_size
+                    )
+        finally:
+            conn.autocommit = False
+            builder.loom.close()
+            signal.set_wakeup_fd(-1)
+            os.close(wakeup_read)
+            os.close(wakeup_write)
+
+    logger.info(f"Membox daemon stopped after {passes} passes ({errors} errors)")
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(description='Membox Background Worker')
     parser.add_argument('--since', default='1h',
                        help='Time window to process (e.g., 1h, 24h, 7d)')
     parser.add_argument('--limit', type=int, default=1000,
-                       help='Max memories per type (default: 1000)')
+                       help='Max memories per run, across all types (default: 1000)')
     parser.add_argument('--types', nargs='+',
-                       default=['debugging_fact', 'claude_memory', 'crystallization'],
+                       default=DEFAULT_MEMORY_TYPES, choices=sorted(MEMORY_TYPES),
                        help='Memory types to process')
     parser.add_argument('--dry-run', action='store_true',
                        help='Preview without processing')
+    parser.add_argument('--batch-size', type=int, default=64,
+                       help='Memories embedded per encode call (default: 64)')
+    parser.add_argument('--itersize', type=int, default=SCAN_ITERSIZE,
+                       help=f'Rows fetched per database round trip (default: {SCAN_ITERSIZE})')
+    parser.add_argument('--workers', type=int, default=1,
+                       help='Processes for signature extraction (default: 1); '
+                            'use with a larger --batch-size for big backfills')
+    parser.add_argument('--keywords-file',
+                       help='File of topic keywords, one per line (# comments allowed); '
+                            'replaces the built-in tech keyword list')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Process only memories past the stored per-type checkpoint '
+                            '(--since bounds the first run)')
+    parser.add_argument('--daemon', action='store_true',
+                       help='Run until stopped, boxing memories as insert triggers announce them '
+                            '(implies --incremental)')
+    parser.add_argument('--max-latency', type=float, default=5.0,
+                       help='Daemon: seconds to micro-batch notifications once woken (default: 5)')
+    parser.add_argument('--poll-interval', type=float, default=300.0,
+                       help='Daemon: seconds between full sweeps of the --since window (default: 300)')
+    parser.add_argument('--stage', choices=['all', 'box', 'link', 'embed'], default='all',
+                       help='all: box, link, then embed any memories still lacking one; box: box only; '
+                            'link: link boxes updated within --since; '
+                            'embed: store embeddings for memories created within --since '
+                            'that lack one (default: all)')
     parser.add_argument('--verbose', action='store_true',
                        help='Enable verbose logging')
 
@@ -260,16 +821,65 @@ def main():
         logger.error(f"Invalid time span: {e}")
         return 1
 
+    keywords = None
+    if args.keywords_file:
+        try:
+            keywords = load_keywords(args.keywords_file)
+        except OSError as e:
+            logger.error(f"Cannot read keywords file: {e}")
+            return 1
+        logger.info(f"Loaded {len(keywords)} keywords from {args.keywords_file}")
+
     # Process memories
     logger.info("="*60)
     logger.info("Membox Worker Starting")
     logger.info("="*60)
 
+    if args.daemon:
+        return run_daemon(
+            since=since,
+            limit=args.limit,
+            memory_types=args.types,
+            batch_size=args.batch_size,
+            itersize=args.itersize,
+            max_latency=args.max_latency,
+            poll_interval=args.poll_interval,
+            workers=args.workers,
+            keywords=keywords
+        )
+
+    if args.stage == 'link':
+        counts = link_recent_boxes(datetime.now() - since)
+        logger.info("="*60)
+        logger.info("Membox Link Stage Complete")
+        logger.info("="*60)
+        logger.info(f"Boxes Linked:  {counts['boxes']}")
+        logger.info(f"Links:         {counts['inserted']} inserted, {counts['updated']} updated")
+        return 0
+
+    if args.stage == 'embed':
+        counts = embed_memories(
+            args.types, since=datetime.now() - since, limit=args.limit,
+            batch_size=args.batch_size, itersize=args.itersize
+        )
+        logger.info("="*60)
+        logger.info("Membox Embed Stage Complete")
+        logger.info("="*60)
+        logger.info(f"Embedded:      {counts['embedded']} of {counts['found']}")
+        logger.info(f"Encode Time:   {counts['encode_seconds']:.2f}s over {counts['batches']} batches")
+        return 0
+
     stats = process_memories_into_membox(
         since=since,
         limit=args.limit,
         memory_types=args.types,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        batch_size=args.batch_size,
+        link=(args.stage == 'all'),
+        itersize=args.itersize,
+        incremental=args.incremental,
+        workers=args.workers,
+        keywords=keywords
     )
 
     logger.info("="*60)
@@ -280,6 +890,13 @@ def main():
     logger.info(f"Boxes Created: {stats['boxes_created']}")
     logger.info(f"Boxes Updated: {stats['boxes_updated']}")
     logger.info(f"Errors:        {stats['errors']}")
+    logger.info(f"Skipped:       {stats['claimed_elsewhere']} claimed by another worker")
+    logger.info(f"Encode Time:   {stats['encode_seconds']:.2f}s over {stats['batches']} batches")
+    logger.info(f"Trace Links:   {stats['links_inserted']} inserted, {stats['links_updated']} updated")
+
+    if args.stage == 'all' and not args.dry_run and EMBEDDINGS_AVAILABLE:
+        embedded = backfill_embeddings(args.types, args.limit, args.batch_size, args.itersize)
+        logger.info(f"Embeddings:    {embedded} stored")
 
     return 0 if stats['errors'] == 0 else 1
 